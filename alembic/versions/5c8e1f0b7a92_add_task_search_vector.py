@@ -0,0 +1,49 @@
+"""add_task_search_vector
+
+Revision ID: 5c8e1f0b7a92
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8e1f0b7a92'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add generated tsvector column with GIN index for full-text search."""
+    op.add_column(
+        'task',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('russian', "
+                "coalesce(name, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        )
+    )
+    op.create_index(
+        'ix_task_search_vector',
+        'task',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Drop full-text search column and index."""
+    op.drop_index('ix_task_search_vector', table_name='task')
+    op.drop_column('task', 'search_vector')
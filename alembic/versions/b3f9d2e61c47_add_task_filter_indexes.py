@@ -0,0 +1,40 @@
+"""add_task_filter_indexes
+
+Revision ID: b3f9d2e61c47
+Revises: 5c8e1f0b7a92
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f9d2e61c47'
+down_revision: Union[str, Sequence[str], None] = '5c8e1f0b7a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite indexes for task list filters."""
+    op.create_index(
+        'ix_task_user_id_status_id', 'task',
+        ['user_id', 'status_id'], unique=False
+    )
+    op.create_index(
+        'ix_task_user_id_deadline_end', 'task',
+        ['user_id', 'deadline_end'], unique=False
+    )
+    op.create_index(
+        'ix_tasktag_tag_id_task_id', 'tasktag',
+        ['tag_id', 'task_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop composite indexes for task list filters."""
+    op.drop_index('ix_tasktag_tag_id_task_id', table_name='tasktag')
+    op.drop_index('ix_task_user_id_deadline_end', table_name='task')
+    op.drop_index('ix_task_user_id_status_id', table_name='task')
@@ -0,0 +1,40 @@
+"""add_document_digest
+
+Revision ID: e8d4a6c0f913
+Revises: b3f9d2e61c47
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8d4a6c0f913'
+down_revision: Union[str, Sequence[str], None] = 'b3f9d2e61c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add content digest and size to documents, allow shared paths."""
+    op.add_column(
+        'document', sa.Column('digest', sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        'document', sa.Column('size', sa.BigInteger(), nullable=True)
+    )
+    op.create_index(
+        'ix_document_digest', 'document', ['digest'], unique=False
+    )
+    op.drop_constraint('document_path_key', 'document', type_='unique')
+
+
+def downgrade() -> None:
+    """Drop content digest and size from documents."""
+    op.create_unique_constraint('document_path_key', 'document', ['path'])
+    op.drop_index('ix_document_digest', table_name='document')
+    op.drop_column('document', 'size')
+    op.drop_column('document', 'digest')
@@ -0,0 +1,34 @@
+"""cascade_tasktag_task_id
+
+Revision ID: f2a7c9e31b84
+Revises: e8d4a6c0f913
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c9e31b84'
+down_revision: Union[str, Sequence[str], None] = 'e8d4a6c0f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Delete task-tag links together with their task."""
+    op.drop_constraint('tasktag_task_id_fkey', 'tasktag', type_='foreignkey')
+    op.create_foreign_key(
+        'tasktag_task_id_fkey', 'tasktag', 'task',
+        ['task_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Restore the task-tag foreign key without cascade."""
+    op.drop_constraint('tasktag_task_id_fkey', 'tasktag', type_='foreignkey')
+    op.create_foreign_key(
+        'tasktag_task_id_fkey', 'tasktag', 'task', ['task_id'], ['id']
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -5,11 +6,16 @@ from fastapi import FastAPI
 
 from src.core.config import settings
 from src.core.keys import Keys
+from src.core.password import shutdown_hash_executor
+from src.core.token_cache import SIGNOUT_CHANNEL, verified_tokens
 from src.db.connection import close_db_pool, init_db_pool
 from src.db.redis import redis_client
 from src.api.v1.router import v1_router
+from src.broker.event_bus_consumer import event_bus_consumer
 from src.broker.rpc_publisher import rpc_publisher
 from src.exception.handlers import register_exception_handlers
+from src.repository.local_cache import CACHE_INVALIDATE_CHANNEL, LocalCache
+from src.storage.client import storage_client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,6 +25,28 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+EVENT_BUS_HANDLERS = {
+    CACHE_INVALIDATE_CHANNEL: LocalCache.handle_invalidation,
+    SIGNOUT_CHANNEL: verified_tokens.handle_signout,
+}
+
+
+def _reset_local_caches() -> None:
+    """
+    Сбрасывает in-process кеши при (пере)подписке на event bus:
+    инвалидации, разосланные во время обрыва, потеряны.
+    """
+    LocalCache.clear_all()
+    verified_tokens.clear()
+
+
+def _log_task_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Фоновая задача %s упала", task.get_name(),
+            exc_info=task.exception(),
+        )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -28,13 +56,24 @@ async def lifespan(app: FastAPI):
     await Keys.initialize(
         private_key_path=settings.JWT_PRIVATE_KEY_PATH,
         public_key_path=settings.JWT_PUBLIC_KEY_PATH,
-        private_key_password=settings.PRIVATE_KEY_PASSWORD
+        private_key_password=settings.PRIVATE_KEY_PASSWORD,
+        extra_public_key_paths=settings.jwt_extra_public_key_paths_list,
+        algorithm=settings.JWT_ALGORITHM,
     )
     await init_db_pool()
+    await storage_client.connect()
 
+    event_bus_task = None
     try:
         await redis_client.connect()
         logger.info("Redis подключен")
+        # Инвалидация in-process кешей, разосланная другими репликами.
+        event_bus_task = asyncio.create_task(
+            event_bus_consumer.run(
+                EVENT_BUS_HANDLERS, on_subscribed=_reset_local_caches
+            )
+        )
+        event_bus_task.add_done_callback(_log_task_failure)
     except Exception as e:
         logger.warning("Redis недоступен: %s", e)
 
@@ -49,9 +88,13 @@ async def lifespan(app: FastAPI):
     yield
 
     # ===== Закрытие =====
+    if event_bus_task:
+        event_bus_task.cancel()
     await redis_client.close()
     await close_db_pool()
+    await storage_client.close()
     await rpc_publisher.close()
+    shutdown_hash_executor()
 
 tags_metadata = [
     {
@@ -74,6 +117,13 @@ tags_metadata = [
             "**Назначение пользователей на задачи**: добавление, удаление и "
             "просмотр исполнителей."
         )
+    },
+    {
+        "name": "metrics",
+        "description": (
+            "**Метрики процесса**: попадания в кеш, задержки "
+            "(только для администраторов)."
+        )
     }
 ]
 
@@ -11,18 +11,19 @@ from src.repository.tasks.tasks import TaskRepository
 from src.repository.users.users import UserRepository
 from src.service.tasks import TaskService
 from src.service.users import UserService
+from src.storage.base import Storage
+from src.storage.client import storage_client
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency для получения сессии БД."""
-    assert db_connection.async_session_factory is not None, "БД не запущена"
-    async with db_connection.async_session_factory() as session:
-        yield session
-
+    """
+    Dependency для получения сессии БД.
 
-async def get_user_session() -> AsyncGenerator[AsyncSession, None]:
+    Одна сессия на запрос: FastAPI кеширует dependency, поэтому
+    user_repo и task_repo получают один и тот же объект.
+    Сессия ленивая — соединение берется из пула только
+    при первом запросе к БД.
     """
-    Отдельная сессия для user_repo."""
     assert db_connection.async_session_factory is not None, "БД не запущена"
     async with db_connection.async_session_factory() as session:
         yield session
@@ -36,28 +37,46 @@ def get_task_repository(
 
 
 def get_user_repository(
-        session: Annotated[AsyncSession, Depends(get_user_session)]
+        session: Annotated[AsyncSession, Depends(get_session)]
 ) -> UserRepository:
     """Dependency для получения репозитория пользователей."""
     return UserRepository(session)
 
 
+_cache_repository: CacheRepository | None = None
+
+
 def get_cache_repository() -> CacheRepository:
-    """Dependency для получения репозитория кеша."""
+    """
+    Dependency для получения репозитория кеша.
+
+    Репозиторий один на клиент Redis, поэтому его Lua-скрипты
+    регистрируются один раз, а не на каждый запрос.
+    """
+    global _cache_repository
     redis = redis_client.get_redis()
-    return CacheRepository(redis)
+    if _cache_repository is None or _cache_repository.redis is not redis:
+        _cache_repository = CacheRepository(redis)
+    return _cache_repository
+
+
+def get_storage() -> Storage:
+    """Dependency для получения хранилища файлов документов."""
+    return storage_client.get_storage()
 
 
 def get_task_service(
         task_repo: Annotated[TaskRepository, Depends(get_task_repository)],
-        cache_repo: Annotated[CacheRepository, Depends(get_cache_repository)]
+        cache_repo: Annotated[CacheRepository, Depends(get_cache_repository)],
+        storage: Annotated[Storage, Depends(get_storage)]
 ) -> TaskService:
     """Dependency для получения сервисного слоя задач с кешем."""
-    return TaskService(task_repo, cache_repo)
+    return TaskService(task_repo, cache_repo, storage)
 
 
 def get_user_service(
-        user_repo: Annotated[UserRepository, Depends(get_user_repository)]
+        user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+        cache_repo: Annotated[CacheRepository, Depends(get_cache_repository)]
 ) -> UserService:
-    """Dependency для получения сервисного слоя пользователей."""
-    return UserService(user_repo)
+    """Dependency для получения сервисного слоя пользователей с кешем."""
+    return UserService(user_repo, cache_repo)
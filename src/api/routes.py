@@ -0,0 +1,68 @@
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from src.core.config import settings
+from src.exception.exceptions import (
+    FileTooLargeException, InvalidHeaderException
+)
+
+# Запас на границы и заголовки частей multipart поверх размера файла.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitRoute(APIRoute):
+    """
+    Маршрут, ограничивающий размер multipart-запроса.
+
+    FastAPI разбирает форму (и Starlette пишет файл во временный файл)
+    до вызова эндпоинта и dependencies, поэтому лимит UPLOAD_MAX_SIZE
+    проверяется здесь, до разбора тела: по Content-Length и по мере
+    чтения тела (на случай chunked-запроса без Content-Length).
+    """
+
+    def get_route_handler(
+        self,
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "")
+            if not content_type.startswith("multipart/form-data"):
+                return await handler(request)
+
+            limit = settings.UPLOAD_MAX_SIZE + MULTIPART_OVERHEAD
+            content_length = request.headers.get("content-length")
+            if content_length is not None:
+                try:
+                    length = int(content_length)
+                except ValueError:
+                    raise InvalidHeaderException("Content-Length") from None
+                if length < 0:
+                    raise InvalidHeaderException("Content-Length")
+                if length > limit:
+                    raise FileTooLargeException(settings.UPLOAD_MAX_SIZE)
+
+            received = 0
+
+            async def limited_receive():
+                nonlocal received
+                message = await request.receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > limit:
+                        # Ошибки при разборе тела FastAPI превращает в 400,
+                        # пропуская только HTTPException.
+                        raise HTTPException(
+                            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            FileTooLargeException(
+                                settings.UPLOAD_MAX_SIZE
+                            ).message,
+                        )
+                return message
+
+            return await handler(Request(request.scope, limited_receive))
+
+        return limited_handler
@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Security as FastAPISecurity, status
+
+from src.core.metrics import Metrics
+from src.core.security import Security
+from src.model.users import UserBase
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Получить метрики процесса"
+)
+async def get_metrics(
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["admin"])
+    ]
+) -> dict:
+    return Metrics.snapshot()
@@ -1,22 +1,37 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import (
-    APIRouter, Depends, Body, Path, UploadFile, File,
+    APIRouter, Depends, Body, Header, Path, Query, Response, UploadFile, File,
     status, Security as FastAPISecurity
 )
+from fastapi.responses import (
+    FileResponse, RedirectResponse, StreamingResponse
+)
+
 from src.api.deps import get_task_service
+from src.api.routes import UploadSizeLimitRoute
 from src.core.security import Security
-from src.model.filters import TaskFilterParams
+from src.model.filters import TaskFilterParams, TaskSearchParams
 from src.model.tasks import (
     DocumentResponse,
     StatusResponse,
     TagCreate, TagResponse,
+    TaskBulkCreate, TaskBulkDelete, TaskBulkResult, TaskBulkUpdate,
     TaskCreate, TaskResponse, TaskUpdate
 )
 from src.model.users import UserBase
 from src.service.tasks import TaskService
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+# Загрузка документов ограничена по размеру до разбора multipart-тела.
+router = APIRouter(
+    prefix="/tasks", tags=["tasks"], route_class=UploadSizeLimitRoute
+)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
 
 
 # ===== Status =====
@@ -37,6 +52,21 @@ async def get_all_statuses(
     return await service.get_all_statuses()
 
 
+@router.delete(
+    "/status/cache",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Сбросить кеш статусов"
+)
+async def reset_statuses_cache(
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["admin"])
+    ]
+) -> None:
+    await service.reset_statuses_cache()
+
+
 # ===== Tag =====
 
 @router.post(
@@ -91,6 +121,57 @@ async def create_task(
     return await service.create_task(data, current_user.id)
 
 
+@router.post(
+    "/bulk",
+    response_model=list[TaskBulkResult],
+    status_code=status.HTTP_201_CREATED,
+    summary="Пакетное создание задач"
+)
+async def bulk_create_tasks(
+    data: Annotated[TaskBulkCreate, Body()],
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["tasks:write"])
+    ]
+) -> list[TaskBulkResult]:
+    return await service.bulk_create_tasks(data, current_user.id)
+
+
+@router.patch(
+    "/bulk",
+    response_model=list[TaskBulkResult],
+    status_code=status.HTTP_200_OK,
+    summary="Пакетное обновление задач"
+)
+async def bulk_update_tasks(
+    data: Annotated[TaskBulkUpdate, Body()],
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["tasks:write"])
+    ]
+) -> list[TaskBulkResult]:
+    return await service.bulk_update_tasks(data, current_user.id)
+
+
+@router.delete(
+    "/bulk",
+    response_model=list[TaskBulkResult],
+    status_code=status.HTTP_200_OK,
+    summary="Пакетное удаление задач"
+)
+async def bulk_delete_tasks(
+    data: Annotated[TaskBulkDelete, Body()],
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["tasks:write"])
+    ]
+) -> list[TaskBulkResult]:
+    return await service.bulk_delete_tasks(data, current_user.id)
+
+
 @router.get(
     "",
     response_model=list[TaskResponse],
@@ -98,14 +179,65 @@ async def create_task(
     summary="Получить информацию о всех задачах"
 )
 async def get_tasks(
+    response: Response,
     service: Annotated[TaskService, Depends(get_task_service)],
-    filters: Annotated[TaskFilterParams, Depends()],
+    filters: Annotated[TaskFilterParams, Query()],
     current_user: Annotated[
         UserBase,
         FastAPISecurity(Security.get_current_user, scopes=["tasks:read"])
     ]
 ) -> list[TaskResponse]:
-    return await service.get_all_tasks(filters, current_user.id)
+    tasks, next_cursor = await service.get_all_tasks(filters, current_user.id)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return tasks
+
+
+@router.get(
+    "/search",
+    response_model=list[TaskResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Полнотекстовый поиск задач"
+)
+async def search_tasks(
+    response: Response,
+    service: Annotated[TaskService, Depends(get_task_service)],
+    params: Annotated[TaskSearchParams, Query()],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["tasks:read"])
+    ]
+) -> list[TaskResponse]:
+    tasks, next_cursor = await service.search_tasks(params, current_user.id)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return tasks
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Выгрузить все задачи (NDJSON или CSV)"
+)
+async def export_tasks(
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["tasks:read"])
+    ],
+    export_format: Annotated[
+        Literal["ndjson", "csv"], Query(alias="format")
+    ] = "ndjson",
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.export_tasks(current_user.id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="tasks.{export_format}"'
+        },
+    )
 
 
 @router.get(
@@ -250,6 +382,68 @@ async def get_task_documents(
     return await service.get_task_documents(task_id, current_user.id)
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Сравнивает ETag с заголовком If-None-Match (слабое сравнение)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    return etag.removeprefix("W/") in candidates
+
+
+@router.get(
+    "/document/{document_id}/content",
+    response_class=FileResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Скачать документ",
+    responses={
+        206: {"description": "Часть файла (заголовок Range)"},
+        304: {"description": "Файл не изменился (If-None-Match)"},
+        307: {"description": "Ссылка на файл во внешнем хранилище"},
+    }
+)
+async def download_document(
+    document_id: Annotated[int, Path(gt=0)],
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["tasks:read"])
+    ],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    doc, stored = await service.get_document_file(
+        document_id, current_user.id
+    )
+    # Внешнее хранилище (S3) отдает файл само по presigned URL,
+    # включая Range и ETag.
+    if stored.url is not None:
+        return RedirectResponse(
+            stored.url, status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
+
+    # Файл не читается в память: FileResponse отдает его с диска
+    # (через http.response.pathsend, если сервер поддерживает sendfile)
+    # и сам обрабатывает Range для докачки.
+    response = FileResponse(
+        stored.path,
+        stat_result=stored.stat,
+        filename=doc.name,
+        headers={"Cache-Control": "private, no-cache"},
+    )
+
+    etag = response.headers["etag"]
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={
+                "ETag": etag,
+                "Cache-Control": response.headers["cache-control"],
+            },
+        )
+    return response
+
+
 @router.delete(
     "/document/{document_id}",
     status_code=status.HTTP_204_NO_CONTENT,
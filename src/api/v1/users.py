@@ -1,18 +1,25 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Form, status
+from fastapi import (
+    APIRouter, BackgroundTasks, Body, Depends, Form, Path, Request,
+    Security as FastAPISecurity, status
+)
 
 from src.api.deps import (
     get_cache_repository,
     get_user_repository,
     get_user_service,
 )
+from src.core.keys import Keys
 from src.core.security import Security
 from src.model.api_schemas import (
+    PasswordHashReportItem,
     RefreshTokenRequest,
+    SessionResponse,
     SignInRequest,
     SignUpRequest,
-    TokenResponse
+    TokenResponse,
+    UserRoleUpdateRequest
 )
 from src.model.users import UserBase
 from src.repository.cache import CacheRepository
@@ -41,11 +48,16 @@ async def signup(
     summary="Вход в систему"
 )
 async def signin(
+    request: Request,
+    background_tasks: BackgroundTasks,
     form_data: Annotated[SignInRequest, Form()],
     user_repo: Annotated[UserRepository, Depends(get_user_repository)],
     cache_repo: Annotated[CacheRepository, Depends(get_cache_repository)],
 ):
-    return await Security.sign_in(form_data, user_repo, cache_repo)
+    client_ip = request.client.host if request.client else None
+    return await Security.sign_in(
+        form_data, user_repo, cache_repo, client_ip, background_tasks
+    )
 
 
 @router.post(
@@ -60,6 +72,18 @@ async def signout(
     await Security.signout(current_user.id, cache_repo)
 
 
+@router.get(
+    "/sessions",
+    response_model=list[SessionResponse],
+    summary="Получить активные сессии текущего пользователя"
+)
+async def get_sessions(
+    current_user: Annotated[UserBase, Depends(Security.get_current_user)],
+    cache_repo: Annotated[CacheRepository, Depends(get_cache_repository)],
+):
+    return await Security.get_sessions(current_user.id, cache_repo)
+
+
 @router.post(
     "/refresh",
     response_model=TokenResponse,
@@ -83,3 +107,43 @@ async def get_me(
     current_user: Annotated[UserBase, Depends(Security.get_current_user)],
 ):
     return current_user
+
+
+@router.patch(
+    "/{user_id}/role",
+    response_model=UserBase,
+    summary="Изменить роль пользователя"
+)
+async def update_user_role(
+    user_id: Annotated[int, Path(gt=0)],
+    data: Annotated[UserRoleUpdateRequest, Body()],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["admin"])
+    ],
+):
+    return await user_service.update_role(user_id, data.role)
+
+
+@router.get(
+    "/password-hashes",
+    response_model=list[PasswordHashReportItem],
+    summary="Отчёт о параметрах хешей паролей"
+)
+async def get_password_hash_report(
+    user_service: Annotated[UserService, Depends(get_user_service)],
+    current_user: Annotated[
+        UserBase,
+        FastAPISecurity(Security.get_current_user, scopes=["admin"])
+    ],
+):
+    return await user_service.get_password_hash_report()
+
+
+@router.get(
+    "/jwks",
+    summary="Публичные ключи для проверки JWT (JWKS)"
+)
+async def get_jwks() -> dict:
+    return Keys.get_jwks()
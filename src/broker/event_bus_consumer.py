@@ -1,28 +1,90 @@
+import asyncio
 import json
 import logging
+from collections.abc import Callable
 
 from src.db.redis import RedisClient, redis_client
 
 logger = logging.getLogger(__name__)
 
+RESUBSCRIBE_BACKOFF_MIN = 1  # секунды
+RESUBSCRIBE_BACKOFF_MAX = 30
+
 
 class EventBusConsumer:
     def __init__(self, redis: RedisClient):
         self.redis = redis
 
-    async def subscribe(self, handlers: dict):
+    async def subscribe(
+        self,
+        handlers: dict,
+        on_subscribed: Callable[[], None] | None = None,
+    ):
+        """
+        Подписывается на каналы и обрабатывает сообщения, пока
+        соединение живо.
+
+        Ошибка разбора или обработчика одного сообщения логируется
+        и не останавливает подписку.
+        """
         pubsub = self.redis.get_redis().pubsub()
-        channels = list(handlers.keys())
-        await pubsub.subscribe(*channels)
-        logger.debug("EventBus: подписался на каналы: %s", channels)
+        try:
+            channels = list(handlers.keys())
+            await pubsub.subscribe(*channels)
+            logger.debug("EventBus: подписался на каналы: %s", channels)
+            if on_subscribed:
+                on_subscribed()
 
-        async for message in pubsub.listen():
-            if message["type"] == "message":
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
                 channel = message["channel"]
-                data = json.loads(message["data"])
                 handler = handlers.get(channel)
-                if handler:
-                    await handler(data)
+                if not handler:
+                    continue
+                try:
+                    await handler(json.loads(message["data"]))
+                except Exception:
+                    logger.exception(
+                        "EventBus: ошибка обработки сообщения из <%s>",
+                        channel,
+                    )
+        finally:
+            await pubsub.aclose()
+
+    async def run(
+        self,
+        handlers: dict,
+        on_subscribed: Callable[[], None] | None = None,
+    ):
+        """
+        subscribe в бесконечном цикле: при обрыве соединения или ошибке
+        подписка восстанавливается с экспоненциальной задержкой.
+
+        on_subscribed вызывается после каждой (пере)подписки: события,
+        пропущенные за время обрыва, не доставляются, поэтому зависящие
+        от них in-process кеши нужно сбросить.
+        """
+        backoff = RESUBSCRIBE_BACKOFF_MIN
+
+        def subscribed():
+            nonlocal backoff
+            backoff = RESUBSCRIBE_BACKOFF_MIN
+            if on_subscribed:
+                on_subscribed()
+
+        while True:
+            try:
+                await self.subscribe(handlers, subscribed)
+                logger.warning("EventBus: подписка завершилась")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("EventBus: ошибка подписки: %s", e)
+
+            logger.info("EventBus: переподписка через %d с", backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RESUBSCRIBE_BACKOFF_MAX)
 
 
 event_bus_consumer = EventBusConsumer(redis_client)
@@ -15,5 +15,15 @@ class EventBusPublisher:
         logger.debug(
             f"EventBus: опубликовал в канал: <{channel}> данные: {payload}")
 
+    async def publish_many(self, events: list[tuple[str, dict]]):
+        """Публикует пачку событий одним pipeline-запросом к Redis."""
+        if not events:
+            return
+        async with self.redis.get_redis().pipeline(transaction=False) as pipe:
+            for channel, payload in events:
+                pipe.publish(channel, json.dumps(payload))
+            await pipe.execute()
+        logger.debug(f"EventBus: опубликовал пачку из {len(events)} событий")
+
 
 event_bus = EventBusPublisher(redis_client)
@@ -8,12 +8,13 @@ app = Celery(
     "src.celery_app.app",
     broker=settings.RABBIT_AMQP,
     backend="rpc://",
-    include=["src.celery_app.celery_tasks"],
+    include=["src.celery_app.celery_tasks", "src.celery_app.document_gc"],
 )
 
 app.conf.task_queues = (
     Queue("emails.welcome"),
     Queue("emails.scheduled"),
+    Queue("documents.gc"),
 )
 
 app.conf.beat_schedule = {
@@ -22,6 +23,11 @@ app.conf.beat_schedule = {
         "schedule": crontab(hour="22", minute="0"),
         "options": {"expires": 3600},
     },
+    "reconcile-document-storage-every-day": {
+        "task": "src.celery_app.document_gc.reconcile_document_storage",
+        "schedule": crontab(hour="3", minute="30"),
+        "options": {"expires": 3600},
+    },
 }
 
 # Запуск воркера:  celery --app src.celery_app.app worker --pool solo --loglevel=INFO
@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+
+import asyncpg
+from dotenv import load_dotenv
+
+from src.celery_app.app import app
+from src.core.config import settings
+from src.storage.base import BLOB_PREFIX, TEMP_PREFIX, Storage, StorageEntry
+from src.storage.client import StorageClient
+from src.storage.local import LocalStorage
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+GC_BATCH_SIZE = 500
+TOMBSTONE_SUFFIX = ".deleted"
+# Файлы до хранилища блобов: {task_id}/{uuid4}_{имя файла} от UPLOAD_DIR.
+# Все остальное в UPLOAD_DIR (.gitkeep, файлы операторов, чужой каталог
+# при неверном UPLOAD_DIR) сверка не трогает.
+LEGACY_KEY_RE = re.compile(
+    r"\d+/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_[^/]+"
+)
+
+
+async def _connect() -> asyncpg.Connection:
+    return await asyncpg.connect(
+        os.environ["DATABASE_URL"].replace("postgresql+asyncpg", "postgresql")
+    )
+
+
+def _batches(items: list, size: int = GC_BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def _referenced_digests(
+    conn: asyncpg.Connection, digests: list[str]
+) -> set[str]:
+    rows = await conn.fetch(
+        "SELECT DISTINCT digest FROM document WHERE digest = ANY($1::text[])",
+        digests,
+    )
+    return {row["digest"] for row in rows}
+
+
+async def _legacy_referenced_paths(conn: asyncpg.Connection) -> set[str]:
+    """
+    Нормализованные (realpath) пути документов, загруженных до хранилища
+    блобов.
+
+    В document путь записан так, как его собрал API
+    (UPLOAD_DIR может быть относительным, со "./" или симлинком),
+    поэтому сравнивать с путями на диске можно только после
+    нормализации обеих сторон. Таких документов конечное число —
+    новые загрузки всегда получают digest.
+
+    Кроме realpath в множество входит хвост пути "{task_id}/{имя}"
+    (имя начинается с uuid): относительный путь из API, разрешенный
+    в другом рабочем каталоге воркера, все равно совпадет.
+    """
+    paths = set()
+    async with conn.transaction():
+        async for row in conn.cursor(
+            "SELECT path FROM document WHERE digest IS NULL"
+        ):
+            paths.add(os.path.realpath(row["path"]))
+            paths.add(_legacy_tail(row["path"]))
+    return paths
+
+
+def _legacy_tail(path: str) -> str:
+    head, name = os.path.split(os.path.normpath(path))
+    return f"{os.path.basename(head)}/{name}"
+
+
+async def _release_blobs(
+    conn: asyncpg.Connection, storage: Storage, blobs: dict[str, str]
+) -> list[str]:
+    """
+    Удаляет блобы {digest: ключ}, на которые нет ссылок в document.
+
+    Блобы сначала переименовываются, затем ссылки проверяются повторно:
+    если параллельная загрузка успела сослаться на тот же digest, блоб
+    возвращается на место. Возвращает ключи удаленных блобов.
+    """
+    referenced = await _referenced_digests(conn, list(blobs))
+
+    tombstones: dict[str, tuple[str, str]] = {}
+    for digest, key in blobs.items():
+        if digest in referenced:
+            continue
+        tombstone = f"{key}.{uuid.uuid4().hex}{TOMBSTONE_SUFFIX}"
+        try:
+            await storage.move(key, tombstone)
+        except FileNotFoundError:
+            continue
+        tombstones[digest] = (key, tombstone)
+
+    if not tombstones:
+        return []
+
+    referenced = await _referenced_digests(conn, list(tombstones))
+    released = []
+    for digest, (key, tombstone) in tombstones.items():
+        if digest in referenced:
+            await storage.move(tombstone, key)
+        else:
+            await storage.delete(tombstone)
+            released.append(key)
+    return released
+
+
+async def _delete_files(files: list[dict]) -> int:
+    # Файлы документов, загруженных до хранилища блобов: путь на диске.
+    removed = 0
+    for file in files:
+        if file.get("digest") is None:
+            try:
+                os.remove(file["path"])
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+    blobs = {
+        file["digest"]: file["path"] for file in files if file.get("digest")
+    }
+    if not blobs:
+        return removed
+
+    storage_client = StorageClient()
+    await storage_client.connect()
+    conn = await _connect()
+    try:
+        storage = storage_client.get_storage()
+        for batch in _batches(list(blobs.items())):
+            released = await _release_blobs(conn, storage, dict(batch))
+            removed += len(released)
+    finally:
+        await conn.close()
+        await storage_client.close()
+    return removed
+
+
+@app.task(
+    queue="documents.gc",
+    autoretry_for=(OSError, asyncpg.PostgresError),
+    max_retries=5,
+    retry_backoff=True
+)
+def delete_document_files(files: list[dict]):
+    """
+    Удаляет файлы удаленных документов пакетами.
+
+    files — список {"path": ..., "digest": ...}. Блоб удаляется, только
+    если на его digest не осталось ссылок. Повторный запуск безопасен.
+    """
+    removed = asyncio.run(_delete_files(files))
+    logger.info(
+        "Файлы документов удалены: %d из %d", removed, len(files)
+    )
+
+
+def _is_stale(entry: StorageEntry, now: float) -> bool:
+    return entry.modified < now - settings.STORAGE_ORPHAN_GRACE_PERIOD
+
+
+async def _reconcile(dry_run: bool) -> dict:
+    now = time.time()
+    report = {
+        "scanned": 0,
+        "orphaned_blobs": 0,
+        "stale_temp": 0,
+        "legacy_files": 0,
+        "reclaimed_bytes": 0,
+        "dry_run": dry_run,
+    }
+
+    storage_client = StorageClient()
+    await storage_client.connect()
+    conn = await _connect()
+    try:
+        storage = storage_client.get_storage()
+
+        # Незавершенные загрузки.
+        async for entry in storage.list_objects(TEMP_PREFIX):
+            report["scanned"] += 1
+            if _is_stale(entry, now):
+                if not dry_run:
+                    await storage.delete(entry.key)
+                report["stale_temp"] += 1
+                report["reclaimed_bytes"] += entry.size
+
+        # Блобы без ссылок в document.
+        candidates: dict[str, StorageEntry] = {}
+        async for entry in storage.list_objects(BLOB_PREFIX):
+            report["scanned"] += 1
+            if not _is_stale(entry, now):
+                continue
+            # Tombstone, брошенный упавшим удалением.
+            if entry.key.endswith(TOMBSTONE_SUFFIX):
+                if not dry_run:
+                    await storage.delete(entry.key)
+                report["stale_temp"] += 1
+                report["reclaimed_bytes"] += entry.size
+                continue
+            candidates[entry.key] = entry
+
+        for batch in _batches(list(candidates.values())):
+            blobs = {entry.key.rsplit("/", 1)[-1]: entry.key for entry in batch}
+            if dry_run:
+                referenced = await _referenced_digests(conn, list(blobs))
+                released = [
+                    key for digest, key in blobs.items()
+                    if digest not in referenced
+                ]
+            else:
+                released = await _release_blobs(conn, storage, blobs)
+            report["orphaned_blobs"] += len(released)
+            report["reclaimed_bytes"] += sum(
+                candidates[key].size for key in released
+            )
+
+        # Файлы до хранилища блобов (LEGACY_KEY_RE), только диск.
+        if isinstance(storage, LocalStorage):
+            legacy: list[StorageEntry] = []
+            async for entry in storage.list_objects(""):
+                if not LEGACY_KEY_RE.fullmatch(entry.key):
+                    continue
+                report["scanned"] += 1
+                if _is_stale(entry, now):
+                    legacy.append(entry)
+
+            referenced = (
+                await _legacy_referenced_paths(conn) if legacy else set()
+            )
+            for entry in legacy:
+                path = os.path.realpath(storage.root / entry.key)
+                if path in referenced or _legacy_tail(path) in referenced:
+                    continue
+                if not dry_run:
+                    await storage.delete(entry.key)
+                report["legacy_files"] += 1
+                report["reclaimed_bytes"] += entry.size
+    finally:
+        await conn.close()
+        await storage_client.close()
+
+    return report
+
+
+@app.task(queue="documents.gc")
+def reconcile_document_storage(dry_run: bool = False) -> dict:
+    """
+    Сверяет хранилище документов с таблицей document и удаляет то,
+    на что нет ссылок: блобы, незавершенные загрузки и старые файлы.
+
+    Объекты моложе STORAGE_ORPHAN_GRACE_PERIOD не трогаются. Возвращает
+    отчет с числом найденных объектов и освобожденных байт.
+    """
+    report = asyncio.run(_reconcile(dry_run))
+    logger.info("Сверка хранилища документов: %s", report)
+    return report
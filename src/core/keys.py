@@ -1,34 +1,149 @@
+import base64
+import hashlib
+
 import aiofiles
 from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
+
+def algorithm_for_key(key) -> str:
+    """
+    Алгоритм JWT, соответствующий типу ключа (приватного или публичного).
+
+    RSA — RS256, EC P-256 — ES256, Ed25519 — EdDSA.
+    """
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if isinstance(key.curve, ec.SECP256R1):
+            return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Неподдерживаемый тип ключа: {type(key).__name__}")
+
+
+def _to_jwk(public_key, algorithm: str) -> dict:
+    if algorithm == "RS256":
+        return RSAAlgorithm.to_jwk(public_key, as_dict=True)
+    if algorithm == "ES256":
+        return ECAlgorithm.to_jwk(public_key, as_dict=True)
+    return OKPAlgorithm.to_jwk(public_key, as_dict=True)
 
 
 class Keys:
+    """
+    Ключи для подписи и проверки JWT.
+
+    Ключи загружаются один раз при старте и хранятся как готовые объекты
+    cryptography, поэтому PEM не разбирается на каждый запрос.
+
+    Токены подписываются текущим приватным ключом, в заголовок кладется
+    его kid. Для проверки доступны несколько публичных ключей
+    (текущий + предыдущие при ротации), ключ выбирается по kid.
+
+    Алгоритм определяется типом ключа: при переходе, например, с RS256
+    на EdDSA старый RSA-ключ остается в extra_public_key_paths, и ранее
+    выданные RS256-токены проверяются до истечения срока.
+    """
     _private_key = None
-    _public_key = None
+    _private_kid: str | None = None
+    _algorithm: str | None = None
+    # kid -> (публичный ключ, алгоритм)
+    _public_keys: dict = {}
 
     @classmethod
     async def initialize(
         cls,
         private_key_path: str,
         public_key_path: str,
-        private_key_password: str
+        private_key_password: str,
+        extra_public_key_paths: list[str] | None = None,
+        algorithm: str = "RS256",
     ):
         if cls._private_key is None:
             async with aiofiles.open(private_key_path, "rb") as f:
                 private_key_data = await f.read()
-            cls._private_key = serialization.load_pem_private_key(
+            private_key = serialization.load_pem_private_key(
                 data=private_key_data,
                 password=private_key_password.encode() if private_key_password else None,
             )
+            key_algorithm = algorithm_for_key(private_key)
+            if key_algorithm != algorithm:
+                raise ValueError(
+                    f"JWT_ALGORITHM={algorithm}, но приватный ключ "
+                    f"подходит для {key_algorithm}"
+                )
+            cls._private_key = private_key
+            cls._algorithm = algorithm
+
+        if not cls._public_keys:
+            for path in [public_key_path, *(extra_public_key_paths or [])]:
+                async with aiofiles.open(path, "rb") as f:
+                    public_key = serialization.load_pem_public_key(
+                        await f.read()
+                    )
+                cls._public_keys[cls.compute_kid(public_key)] = (
+                    public_key, algorithm_for_key(public_key)
+                )
 
-        if cls._public_key is None:
-            async with aiofiles.open(public_key_path) as f:
-                cls._public_key = await f.read()
+            cls._private_kid = cls.compute_kid(cls._private_key.public_key())
+
+    @staticmethod
+    def compute_kid(public_key) -> str:
+        """kid = base64url(sha256(DER SubjectPublicKeyInfo)), 16 символов."""
+        der = public_key.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        digest = hashlib.sha256(der).digest()
+        return base64.urlsafe_b64encode(digest).decode("utf-8")[:16]
 
     @classmethod
     def get_private_key(cls):
         return cls._private_key
 
     @classmethod
-    def get_public_key(cls):
-        return cls._public_key
+    def get_private_kid(cls) -> str | None:
+        return cls._private_kid
+
+    @classmethod
+    def get_algorithm(cls) -> str | None:
+        """Алгоритм подписи новых токенов."""
+        return cls._algorithm
+
+    @classmethod
+    def get_public_keys(
+        cls, kid: str | None, header_alg: str | None
+    ) -> list[tuple]:
+        """
+        Кандидаты (публичный ключ, алгоритм) для проверки токена.
+
+        С kid — ровно ключ с этим kid. Без kid (токены, выпущенные
+        до появления kid) — все настроенные ключи, чей алгоритм совпадает
+        с alg из заголовка, текущий ключ подписи первым. Так RS256-токены
+        проверяются старым RSA-ключом из extra_public_key_paths и после
+        перехода на EdDSA/ES256. Сам алгоритм проверки всегда берется
+        из ключа, а не из заголовка.
+        """
+        if kid is not None:
+            key = cls._public_keys.get(kid)
+            return [key] if key else []
+
+        return [
+            key for _, key in sorted(
+                cls._public_keys.items(),
+                key=lambda item: item[0] != cls._private_kid,
+            )
+            if key[1] == header_alg
+        ]
+
+    @classmethod
+    def get_jwks(cls) -> dict:
+        """Публичные ключи в формате JWKS (RFC 7517)."""
+        keys = []
+        for kid, (public_key, algorithm) in cls._public_keys.items():
+            jwk = _to_jwk(public_key, algorithm)
+            jwk.update({"kid": kid, "use": "sig", "alg": algorithm})
+            keys.append(jwk)
+        return {"keys": keys}
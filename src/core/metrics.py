@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    Счетчики и тайминги процесса (in-memory, на одну реплику API).
+
+    Используются для оценки попаданий в кеш, задержек и т.п.,
+    отдаются админским эндпоинтом /api/v1/metrics.
+    """
+    _counters: dict[str, int] = defaultdict(int)
+    _timings: dict[str, dict[str, float]] = {}
+
+    @classmethod
+    def incr(cls, name: str, value: int = 1) -> None:
+        """Увеличивает счетчик."""
+        cls._counters[name] += value
+
+    @classmethod
+    def observe(cls, name: str, seconds: float) -> None:
+        """Добавляет замер длительности (count, sum, max)."""
+        timing = cls._timings.setdefault(
+            name, {"count": 0, "sum": 0.0, "max": 0.0}
+        )
+        timing["count"] += 1
+        timing["sum"] += seconds
+        timing["max"] = max(timing["max"], seconds)
+
+    @classmethod
+    def hit_ratio(cls, name: str) -> float | None:
+        """Доля попаданий для пары счетчиков {name}:hit / {name}:miss."""
+        hits = cls._counters.get(f"{name}:hit", 0)
+        misses = cls._counters.get(f"{name}:miss", 0)
+        total = hits + misses
+        return hits / total if total else None
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """Возвращает текущие значения всех счетчиков и таймингов."""
+        cache_names = {
+            name.rsplit(":", 1)[0]
+            for name in cls._counters
+            if name.endswith((":hit", ":miss"))
+        }
+        return {
+            "counters": dict(cls._counters),
+            "hit_ratios": {
+                name: cls.hit_ratio(name) for name in sorted(cache_names)
+            },
+            "timings": {
+                name: {
+                    **timing,
+                    "avg": timing["sum"] / timing["count"],
+                }
+                for name, timing in cls._timings.items()
+            },
+        }
@@ -1,5 +1,14 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from src.core.config import settings
+from src.core.metrics import Metrics
+from src.exception.exceptions import ServiceOverloadedException
+
 pwd_context = CryptContext(
     schemes=["argon2"],
     argon2__memory_cost=131072,
@@ -7,6 +16,15 @@ pwd_context = CryptContext(
     argon2__time_cost=3,
 )
 
+# Argon2 тяжелый по CPU и памяти: считаем его в отдельном ограниченном
+# пуле потоков, чтобы не блокировать event loop.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="argon2",
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
 
 def get_password_hash(password: str) -> str:
     """Хеширует пароль с использованием Argon2."""
@@ -16,3 +34,66 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Проверяет соответствие пароля хешу."""
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Проверяет, посчитан ли хеш с устаревшими параметрами pwd_context."""
+    return pwd_context.needs_update(hashed_password)
+
+
+def _release_pending(_future=None) -> None:
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+async def _run_in_hash_executor(metric: str, func, *args):
+    """
+    Выполняет func в пуле хеширования.
+
+    Если в очереди уже PASSWORD_HASH_MAX_PENDING задач,
+    сразу отказывает (503), а не копит запросы.
+    """
+    global _pending
+    with _pending_lock:
+        overloaded = _pending >= settings.PASSWORD_HASH_MAX_PENDING
+        if not overloaded:
+            _pending += 1
+    if overloaded:
+        Metrics.incr("password:rejected")
+        raise ServiceOverloadedException("Сервис аутентификации")
+
+    started = time.perf_counter()
+    try:
+        future = _hash_executor.submit(func, *args)
+    except BaseException:
+        _release_pending()
+        raise
+    # Место в очереди освобождается, когда задача завершилась в пуле:
+    # при отмене запроса уже запущенный хеш продолжает занимать поток.
+    future.add_done_callback(_release_pending)
+    try:
+        return await asyncio.wrap_future(future)
+    finally:
+        Metrics.observe(metric, time.perf_counter() - started)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Хеширует пароль в пуле хеширования (не блокирует event loop)."""
+    return await _run_in_hash_executor(
+        "password:hash", get_password_hash, password
+    )
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    """Проверяет пароль в пуле хеширования (не блокирует event loop)."""
+    return await _run_in_hash_executor(
+        "password:verify", verify_password, plain_password, hashed_password
+    )
+
+
+def shutdown_hash_executor() -> None:
+    """Останавливает пул хеширования."""
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
@@ -4,30 +4,39 @@ import uuid
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import BackgroundTasks, Depends, HTTPException, status
 
 from fastapi.security import (
     HTTPAuthorizationCredentials,
     HTTPBearer,
     SecurityScopes
 )
-from jwt.exceptions import PyJWTError
+from jwt.exceptions import InvalidSignatureError, PyJWTError
 
+from src.broker.event_bus_publisher import event_bus
+from src.core.config import settings
 from src.core.keys import Keys
-from src.core.password import verify_password
+from src.core.metrics import Metrics
+from src.core.password import (
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async
+)
+from src.core.token_cache import SIGNOUT_CHANNEL, verified_tokens
 from src.model.users import UserBase
 from src.model.api_schemas import (
-    SignInRequest, TokenResponse
+    SessionResponse, SignInRequest, TokenResponse
 )
 from src.repository.cache import CacheRepository
+from src.repository.local_cache import user_cache
 from src.repository.users.users import UserRepository
 from src.api.deps import get_user_repository, get_cache_repository
+import src.db.connection as db_connection
 
 logger = logging.getLogger(__name__)
 
 bearer_scheme = HTTPBearer()
 
-ALGORITHM = "RS256"
 ACCESS_TOKEN_EXPIRE = 1  # в часах
 REFRESH_TOKEN_EXPIRE = 168
 
@@ -46,6 +55,7 @@ class Security:
     Аутентификация:
         - sign_in: вход по логину и паролю
         - signout: выход (удаление refresh-токенов)
+        - get_sessions: активные сессии пользователя
         - get_current_user: получение текущего пользователя из токена
 
     Токены:
@@ -60,8 +70,14 @@ class Security:
         token_expire: int,
         scopes: list[str],
         cache_repo: CacheRepository | None = None,
+        replaced_jti: str | None = None,
     ) -> str:
-        """Создаёт JWT-токен (access или refresh)."""
+        """
+        Создаёт JWT-токен (access или refresh).
+
+        Если передан replaced_jti, новый refresh-токен заменяет
+        старый в индексе сессий (ротация).
+        """
         now = dt.datetime.now(dt.UTC)
         jti = str(uuid.uuid4())
 
@@ -75,21 +91,41 @@ class Security:
         }
 
         token = jwt.encode(
-            payload, Keys.get_private_key(), algorithm=ALGORITHM
+            payload,
+            Keys.get_private_key(),
+            algorithm=Keys.get_algorithm(),
+            headers={"kid": Keys.get_private_kid()},
         )
 
         # Refresh-токен сохраняем в Redis для возможности отзыва.
         if token_type == "refresh" and cache_repo:
             ttl = int(dt.timedelta(hours=token_expire).total_seconds())
-            await cache_repo.setex(
-                cache_repo.key_token(user_id, jti), ttl, token
-            )
+            if replaced_jti:
+                rotated = await cache_repo.rotate_session(
+                    user_id, replaced_jti, jti, ttl, token
+                )
+                if not rotated:
+                    logger.warning(
+                        "Обновление токена отклонено: сессия истекла, "
+                        "user_id=%d",
+                        user_id,
+                    )
+                    raise HTTPException(
+                        status.HTTP_401_UNAUTHORIZED,
+                        "Сессия истекла.",
+                    )
+            else:
+                await cache_repo.add_session(user_id, jti, ttl, token)
 
         return token
 
     @classmethod
     async def create_tokens(
-        cls, user_id: int, role: str, cache_repo: CacheRepository | None = None
+        cls,
+        user_id: int,
+        role: str,
+        cache_repo: CacheRepository | None = None,
+        replaced_jti: str | None = None,
     ) -> tuple[str, str]:
         """Создаёт пару access + refresh токенов для пользователя."""
         scope_names = ROLE_SCOPES.get(role, [])
@@ -98,7 +134,8 @@ class Security:
             user_id, "access", ACCESS_TOKEN_EXPIRE, scope_names
         )
         refresh_token = await cls._create_token(
-            user_id, "refresh", REFRESH_TOKEN_EXPIRE, scope_names, cache_repo
+            user_id, "refresh", REFRESH_TOKEN_EXPIRE, scope_names,
+            cache_repo, replaced_jti
         )
 
         return access_token, refresh_token
@@ -111,7 +148,7 @@ class Security:
         cache_repo: CacheRepository,
     ) -> TokenResponse:
         """Обновляет токены по валидному refresh-токену."""
-        user_id, _, token_jti = await cls._decode_token(
+        user_id, _, token_jti, _ = await cls._decode_token(
             refresh_token, require_refresh=True
         )
 
@@ -121,38 +158,73 @@ class Security:
                 "Неверные учетные данные.",
             )
 
-        key = cache_repo.key_token(user_id, token_jti)
-        if await cache_repo.get(key) is None:
-            logger.warning(
-                "Обновление токена отклонено: сессия истекла, user_id=%d",
-                user_id,
-            )
-            raise HTTPException(
-                status.HTTP_401_UNAUTHORIZED,
-                "Сессия истекла.",
-            )
-
+        # Проверка, что старый токен не отозван, и его замена на новый
+        # выполняются одним Lua-скриптом в create_tokens (replaced_jti).
         user_dto = await user_repo.get_user_by_user_id(user_id)
-        await cache_repo.delete(key)
 
         access, refresh = await cls.create_tokens(
-            user_id, user_dto.role, cache_repo
+            user_id, user_dto.role, cache_repo, replaced_jti=token_jti
         )
         return TokenResponse(
             access_token=access,
             refresh_token=refresh,
         )
 
+    @staticmethod
+    async def _check_login_rate_limit(
+        username: str, client_ip: str | None, cache_repo: CacheRepository
+    ) -> None:
+        """
+        Ограничивает попытки входа по логину и IP клиента.
+
+        Проверяется до Argon2, чтобы перебор паролей не съедал CPU.
+        """
+        limits = {
+            cache_repo.key_login_username(username):
+                settings.LOGIN_ATTEMPTS_PER_USERNAME,
+        }
+        if client_ip:
+            limits[cache_repo.key_login_ip(client_ip)] = (
+                settings.LOGIN_ATTEMPTS_PER_IP
+            )
+
+        retry_after = await cache_repo.hit_rate_limit(
+            limits, settings.LOGIN_ATTEMPTS_WINDOW
+        )
+        if retry_after:
+            Metrics.incr("login:blocked")
+            logger.warning(
+                "Попытка входа заблокирована: username=%s, ip=%s",
+                username, client_ip,
+            )
+            raise HTTPException(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Слишком много попыток входа.",
+                headers={"Retry-After": str(retry_after)},
+            )
+        Metrics.incr("login:allowed")
+
     @classmethod
     async def sign_in(
         cls,
         form_data: SignInRequest,
         user_repo: UserRepository,
         cache_repo: CacheRepository,
+        client_ip: str | None = None,
+        background_tasks: BackgroundTasks | None = None,
     ) -> TokenResponse:
         """Проверяет логин и пароль, возвращает токены."""
+        await cls._check_login_rate_limit(
+            form_data.username, client_ip, cache_repo
+        )
+
         try:
-            user_dto = await user_repo.get_user_by_login(form_data.username)
+            # Короткая транзакция: соединение возвращается в пул до
+            # проверки пароля, а не в конце запроса.
+            async with user_repo.session.begin():
+                user_dto = await user_repo.get_user_by_login(
+                    form_data.username
+                )
         except ValueError:
             logger.warning(
                 "Неудачная попытка входа: пользователь не найден, username=%s",
@@ -163,7 +235,9 @@ class Security:
                 "Неверный логин или пароль.",
             )
 
-        if not verify_password(form_data.password, user_dto.hashed_password):
+        if not await verify_password_async(
+            form_data.password, user_dto.hashed_password
+        ):
             logger.warning(
                 "Неудачная попытка входа: неверный пароль, username=%s",
                 form_data.username,
@@ -173,6 +247,17 @@ class Security:
                 "Неверный логин или пароль.",
             )
 
+        # Хеш со старыми параметрами Argon2 пересчитываем после ответа.
+        if background_tasks and password_needs_rehash(
+            user_dto.hashed_password
+        ):
+            background_tasks.add_task(
+                cls._upgrade_password_hash,
+                user_dto.id,
+                form_data.password,
+                user_dto.hashed_password,
+            )
+
         access, refresh = await cls.create_tokens(
             user_dto.id, user_dto.role, cache_repo
         )
@@ -182,15 +267,71 @@ class Security:
             refresh_token=refresh,
         )
 
+    @staticmethod
+    async def _upgrade_password_hash(
+        user_id: int, password: str, old_hash: str
+    ) -> None:
+        """
+        Пересчитывает хеш пароля с текущими параметрами pwd_context.
+
+        Выполняется в фоне после ответа на вход, в пуле хеширования
+        и в собственной сессии БД. Хеш заменяется, только если в БД
+        все еще old_hash: иначе пароль успели сменить, и перезапись
+        вернула бы старый пароль. При ошибке хеш останется старым
+        и будет пересчитан при следующем входе.
+        """
+        if db_connection.async_session_factory is None:
+            return
+
+        try:
+            hashed_password = await get_password_hash_async(password)
+            async with db_connection.async_session_factory() as session:
+                replaced = await UserRepository(
+                    session
+                ).replace_user_password_hash(
+                    user_id, old_hash, hashed_password
+                )
+            if not replaced:
+                logger.info(
+                    "Пароль сменён до обновления хеша: user_id=%d", user_id
+                )
+                return
+            Metrics.incr("password:rehashed")
+            logger.info("Хеш пароля обновлён: user_id=%d", user_id)
+        except Exception as e:
+            logger.warning(
+                "Не удалось обновить хеш пароля: user_id=%d, %s", user_id, e
+            )
+
     @classmethod
     async def _decode_token(
         cls, token: str, require_refresh: bool = False
-    ) -> tuple[int, list[str], str | None]:
-        """Декодирует и валидирует JWT-токен."""
+    ) -> tuple[int, list[str], str | None, float]:
+        """
+        Декодирует и валидирует JWT-токен.
+
+        Возвращает (user_id, scopes, jti, exp).
+        """
         try:
-            payload = jwt.decode(
-                token, Keys.get_public_key(), algorithms=[ALGORITHM]
+            header = jwt.get_unverified_header(token)
+            candidates = Keys.get_public_keys(
+                header.get("kid"), header.get("alg")
             )
+            if not candidates:
+                raise PyJWTError()
+
+            # Алгоритм берём из ключа, а не из заголовка токена.
+            payload = None
+            for public_key, algorithm in candidates:
+                try:
+                    payload = jwt.decode(
+                        token, public_key, algorithms=[algorithm]
+                    )
+                    break
+                except InvalidSignatureError:
+                    continue
+            if payload is None:
+                raise PyJWTError()
 
             if require_refresh and payload.get("type") != "refresh":
                 raise PyJWTError()
@@ -199,7 +340,12 @@ class Security:
             if user_id is None:
                 raise PyJWTError()
 
-            return int(user_id), payload.get("scopes", []), payload.get("jti")
+            return (
+                int(user_id),
+                payload.get("scopes", []),
+                payload.get("jti"),
+                payload["exp"],
+            )
 
         except PyJWTError:
             raise HTTPException(
@@ -207,6 +353,25 @@ class Security:
                 "Неверные учетные данные."
             ) from None
 
+    @classmethod
+    async def _verify_access_token(
+        cls, token: str
+    ) -> tuple[int, list[str]]:
+        """
+        Проверяет access-токен, используя кеш проверенных токенов.
+
+        Возвращает (user_id, scopes).
+        """
+        cached = verified_tokens.get(token)
+        if cached is not None:
+            Metrics.incr("cache:verified_token:hit")
+            return cached
+        Metrics.incr("cache:verified_token:miss")
+
+        user_id, scopes, _, exp = await cls._decode_token(token)
+        verified_tokens.set(token, user_id, scopes, exp)
+        return user_id, scopes
+
     @staticmethod
     async def _check_scopes(
         security_scopes: SecurityScopes,
@@ -235,16 +400,49 @@ class Security:
         user_repo: Annotated[UserRepository, Depends(get_user_repository)],
         cache_repo: Annotated[CacheRepository, Depends(get_cache_repository)]
     ) -> UserBase:
-        """Dependency: извлекает текущего пользователя из access-токена."""
-        user_id, token_scopes, _ = await cls._decode_token(access.credentials)
+        """
+        Dependency: извлекает текущего пользователя из access-токена.
+
+        Scopes проверяются дважды: по токену (до загрузки пользователя)
+        и по текущей роли пользователя. Так смена роли действует сразу
+        после инвалидации кеша пользователя, а не через час, когда
+        истечет токен со старыми scopes.
+        """
+        user_id, token_scopes = await cls._verify_access_token(
+            access.credentials
+        )
         await cls._check_scopes(security_scopes, token_scopes)
 
+        user = await cls._load_user(user_id, user_repo, cache_repo)
+        await cls._check_scopes(
+            security_scopes, ROLE_SCOPES.get(user.role, [])
+        )
+        return user
+
+    @staticmethod
+    async def _load_user(
+        user_id: int,
+        user_repo: UserRepository,
+        cache_repo: CacheRepository,
+    ) -> UserBase:
+        """Загружает пользователя: L1 (память процесса) -> Redis -> БД."""
         cache_key = cache_repo.key_user(user_id)
+        local = user_cache.get(cache_key)
+        if local is not None:
+            Metrics.incr("cache:user_l1:hit")
+            return local
+        Metrics.incr("cache:user_l1:miss")
+
         cached = await cache_repo.get(cache_key)
         if cached:
-            return UserBase.model_validate_json(cached)
-
-        user_dto = await user_repo.get_user_by_user_id(user_id)
+            user = UserBase.model_validate_json(cached)
+            user_cache.set(cache_key, user)
+            return user
+
+        # Короткая транзакция: соединение сразу возвращается в пул,
+        # а сессия остается свободной для репозиториев эндпоинта.
+        async with user_repo.session.begin():
+            user_dto = await user_repo.get_user_by_user_id(user_id)
         user = UserBase.model_validate(user_dto)
 
         await cache_repo.setex(
@@ -252,12 +450,29 @@ class Security:
             3600,
             user.model_dump_json()
         )
+        user_cache.set(cache_key, user)
 
         return user
 
+    @staticmethod
+    async def get_sessions(
+        user_id: int, cache_repo: CacheRepository
+    ) -> list[SessionResponse]:
+        """Возвращает активные сессии (refresh-токены) пользователя."""
+        sessions = await cache_repo.get_sessions(user_id)
+        return [
+            SessionResponse(jti=jti, expires_in=ttl)
+            for jti, ttl in sessions.items()
+        ]
+
     @classmethod
     async def signout(cls, user_id: int, cache_repo: CacheRepository) -> None:
         """Удаляет все refresh-токены пользователя из Redis."""
-        await cache_repo.delete_by_pattern(f"user:{user_id}:token:*")
+        await cache_repo.revoke_sessions(user_id)
+
+        # Проверенные токены пользователя убираем из кеша всех реплик.
+        verified_tokens.evict_user(user_id)
+        await event_bus.publish(SIGNOUT_CHANNEL, {"user_id": user_id})
+
         logger.info("Пользователь вышел: user_id=%d", user_id)
 
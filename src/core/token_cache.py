@@ -0,0 +1,71 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+SIGNOUT_CHANNEL = "auth:signout"
+
+
+class VerifiedTokenCache:
+    """
+    LRU-кеш уже проверенных access-токенов (в памяти процесса).
+
+    Ключ — sha256 токена, значение — (user_id, scopes, exp).
+    Запись действует до exp токена, поэтому повторный запрос
+    с тем же токеном не требует проверки RSA-подписи.
+
+    При signout записи пользователя удаляются на всех репликах
+    через event bus (канал SIGNOUT_CHANNEL).
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[int, list[str], float]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> tuple[int, list[str]] | None:
+        """Возвращает (user_id, scopes) для непросроченного токена."""
+        key = self._key(token)
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        user_id, scopes, exp = item
+        if exp <= time.time():
+            self._data.pop(key, None)
+            return None
+
+        self._data.move_to_end(key)
+        return user_id, scopes
+
+    def set(
+        self, token: str, user_id: int, scopes: list[str], exp: float
+    ) -> None:
+        """Сохраняет проверенный токен до его истечения."""
+        key = self._key(token)
+        self._data[key] = (user_id, scopes, exp)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def evict_user(self, user_id: int) -> None:
+        """Удаляет все токены пользователя."""
+        for key in [
+            key for key, item in self._data.items() if item[0] == user_id
+        ]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        """Удаляет все токены."""
+        self._data.clear()
+
+    async def handle_signout(self, data: dict) -> None:
+        """Обработчик события signout из event bus."""
+        self.evict_user(int(data["user_id"]))
+
+
+verified_tokens = VerifiedTokenCache()
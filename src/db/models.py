@@ -1,6 +1,9 @@
 import datetime
 
-from sqlalchemy import BigInteger, Date, ForeignKey, String, UniqueConstraint
+from sqlalchemy import (
+    BigInteger, Computed, Date, ForeignKey, Index, String, UniqueConstraint
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -13,12 +16,16 @@ class Document(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(String(128))
-    path: Mapped[str] = mapped_column(String(256), unique=True)
+    # Несколько документов могут ссылаться на один блоб.
+    path: Mapped[str] = mapped_column(String(256))
     task_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("task.id", ondelete="CASCADE"),
         index=True
     )
+    # SHA-256 содержимого (hex); NULL у документов до хранилища блобов.
+    digest: Mapped[str | None] = mapped_column(String(64), index=True)
+    size: Mapped[int | None] = mapped_column(BigInteger)
 
 
 class Status(Base):
@@ -31,12 +38,15 @@ class Status(Base):
 class TaskTag(Base):
     """Связующая таблица: Task (many) <-> Tag (many)."""
     __tablename__ = "tasktag"
-    __table_args__ = (UniqueConstraint("task_id", "tag_id"),)
+    __table_args__ = (
+        UniqueConstraint("task_id", "tag_id"),
+        Index("ix_tasktag_tag_id_task_id", "tag_id", "task_id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     task_id: Mapped[int] = mapped_column(
         BigInteger,
-        ForeignKey("task.id"),
+        ForeignKey("task.id", ondelete="CASCADE"),
         index=True
     )
     tag_id: Mapped[int] = mapped_column(
@@ -60,6 +70,15 @@ class Tag(Base):
 
 class Task(Base):
     __tablename__ = "task"
+    __table_args__ = (
+        Index(
+            "ix_task_search_vector",
+            "search_vector",
+            postgresql_using="gin"
+        ),
+        Index("ix_task_user_id_status_id", "user_id", "status_id"),
+        Index("ix_task_user_id_deadline_end", "user_id", "deadline_end"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(String(512))
@@ -79,6 +98,16 @@ class Task(Base):
         ForeignKey("user.id", ondelete="CASCADE"),
         index=True
     )
+    # Полнотекстовый поиск по name + description.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('russian', "
+            "coalesce(name, '') || ' ' || coalesce(description, ''))",
+            persisted=True
+        ),
+        nullable=True
+    )
 
 
 # ===== User =====
@@ -52,3 +52,43 @@ class ResourceNotCreatedException(AppException):
         message = f"{resource} не удалось создать."
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         super().__init__(message, status_code)
+
+
+class InvalidCursorException(AppException):
+    """Курсор пагинации некорректен."""
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+
+        message = f"Некорректный курсор пагинации: {cursor}."
+        status_code = status.HTTP_400_BAD_REQUEST
+        super().__init__(message, status_code)
+
+
+class ServiceOverloadedException(AppException):
+    """Сервис перегружен, запрос отклонен."""
+    def __init__(self, resource: str):
+        self.resource = resource
+
+        message = f"{resource} перегружен, повторите запрос позже."
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        super().__init__(message, status_code)
+
+
+class InvalidHeaderException(AppException):
+    """Заголовок запроса некорректен."""
+    def __init__(self, header: str):
+        self.header = header
+
+        message = f"Некорректный заголовок {header}."
+        status_code = status.HTTP_400_BAD_REQUEST
+        super().__init__(message, status_code)
+
+
+class FileTooLargeException(AppException):
+    """Размер загружаемого файла превышает допустимый."""
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+        message = f"Размер файла превышает {max_size} байт."
+        status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        super().__init__(message, status_code)
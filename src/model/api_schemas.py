@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -8,6 +10,12 @@ class TokenResponse(BaseModel):
     token_type: str = "Bearer"
 
 
+class SessionResponse(BaseModel):
+    """Активная сессия (refresh-токен) пользователя."""
+    jti: str
+    expires_in: int  # секунд до истечения
+
+
 class RefreshTokenRequest(BaseModel):
     """Схема для обновления токена."""
     refresh_token: str
@@ -25,3 +33,15 @@ class SignInRequest(BaseModel):
     """Схема для входа в систему (передаётся через Form)."""
     username: str = Field(min_length=3, max_length=64)
     password: str = Field(min_length=8, max_length=256)
+
+
+class UserRoleUpdateRequest(BaseModel):
+    """Схема для изменения роли пользователя (администратором)."""
+    role: Literal["user", "admin"]
+
+
+class PasswordHashReportItem(BaseModel):
+    """Количество пользователей с данным набором параметров Argon2."""
+    params: str
+    users: int
+    outdated: bool
@@ -1,14 +1,23 @@
+import datetime
 from typing import Literal
 from pydantic import BaseModel, Field
 
 
 class TaskFilterParams(BaseModel):
-    """Модель Query-параметров для пагинации и сортировки."""
+    """
+    Модель Query-параметров для фильтрации, пагинации и сортировки.
+
+    Поддерживает два режима пагинации:
+        - offset: limit + offset (по умолчанию)
+        - keyset: limit + cursor из заголовка X-Next-Cursor
+          предыдущей страницы (offset игнорируется)
+    """
     model_config = {"extra": "forbid"}  # Запрещаем доп.параметры.
 
     # Пагинация.
     limit: int = Field(default=100, ge=0)
     offset: int = Field(default=0, ge=0)
+    cursor: str | None = None
 
     # Сортировка.
     order_by: Literal[
@@ -19,3 +28,28 @@ class TaskFilterParams(BaseModel):
         "status_id"
     ] = "id"
     order_direction: Literal["asc", "desc"] = "desc"
+
+    # Фильтрация.
+    status_id: int | None = Field(default=None, gt=0)
+    tag_id: list[int] = Field(default_factory=list)
+    tag_match: Literal["any", "all"] = "any"
+    deadline_after: datetime.date | None = None
+    deadline_before: datetime.date | None = None
+    overdue: bool | None = None
+
+
+class TaskSearchParams(BaseModel):
+    """
+    Модель Query-параметров для полнотекстового поиска задач.
+
+    Результаты отсортированы по релевантности (ts_rank), пагинация
+    аналогична TaskFilterParams: limit + offset или limit + cursor.
+    """
+    model_config = {"extra": "forbid"}  # Запрещаем доп.параметры.
+
+    q: str = Field(min_length=1, max_length=256)
+
+    # Пагинация.
+    limit: int = Field(default=100, ge=0)
+    offset: int = Field(default=0, ge=0)
+    cursor: str | None = None
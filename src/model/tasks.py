@@ -89,3 +89,44 @@ class TaskUpdate(BaseModel):
                 raise ValueError(
                     'Дата окончания не может быть раньше даты начала')
         return self
+
+
+BULK_MAX_ITEMS = 1000
+
+
+class TaskBulkCreate(BaseModel):
+    """Модель для пакетного создания задач."""
+    tasks: list[TaskCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """Изменения одной задачи в пакетном обновлении."""
+    id: int = Field(gt=0)
+
+
+class TaskBulkUpdate(BaseModel):
+    """Модель для пакетного обновления задач."""
+    tasks: list[TaskBulkUpdateItem] = Field(
+        min_length=1, max_length=BULK_MAX_ITEMS
+    )
+
+    @model_validator(mode='after')
+    def check_unique_ids(self) -> Self:
+        """Проверка, что каждая задача указана не больше одного раза."""
+        ids = [task.id for task in self.tasks]
+        if len(ids) != len(set(ids)):
+            raise ValueError('ID задач в пакете не должны повторяться')
+        return self
+
+
+class TaskBulkDelete(BaseModel):
+    """Модель для пакетного удаления задач."""
+    ids: list[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkResult(BaseModel):
+    """Результат пакетной операции для одной задачи."""
+    id: int | None = None
+    success: bool
+    detail: str | None = None
+    task: TaskResponse | None = None
@@ -1,8 +1,79 @@
+import time
+import uuid
+
 from redis.asyncio import Redis
 
+# Удаляет refresh-токены пользователя из индекса его сессий.
+# Все ключи передаются через KEYS, имена в Lua не собираются.
+# KEYS[1] — множество JTI, KEYS[2..] — ключи токенов;
+# ARGV — JTI в том же порядке, что и ключи токенов.
+# В Redis Cluster ключи одного вызова должны лежать в одном hash slot;
+# текущие форматы ключей без hash tag на кластер не рассчитаны.
+REVOKE_SESSIONS_SCRIPT = """
+for i, jti in ipairs(ARGV) do
+    redis.call('DEL', KEYS[i + 1])
+end
+return redis.call('SREM', KEYS[1], unpack(ARGV))
+"""
+
+# Атомарная ротация refresh-токена: старый JTI можно погасить только один
+# раз, поэтому из двух параллельных refresh успешен ровно один.
+# Токен должен быть в индексе сессий: токены, выданные до индекса,
+# не ротируются, иначе signout (revoke_sessions) их бы не отзывал.
+# KEYS: старый токен, новый токен, множество JTI.
+# ARGV: старый JTI, новый JTI, TTL, новый токен.
+ROTATE_SESSION_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[3], ARGV[1]) == 0 then
+    return 0
+end
+if redis.call('DEL', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('SREM', KEYS[3], ARGV[1])
+redis.call('SETEX', KEYS[2], ARGV[3], ARGV[4])
+redis.call('SADD', KEYS[3], ARGV[2])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return 1
+"""
+
+# Скользящее окно на sorted set: для каждого ключа удаляются попытки
+# старше окна; если хоть один лимит исчерпан, попытка не засчитывается
+# и возвращается время ожидания (мс), иначе попытка записывается во все
+# ключи и возвращается 0.
+# KEYS: ключи окон. ARGV: now_ms, window_ms, member, лимиты по ключам.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[3 + i]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local wait = tonumber(oldest[2]) + window - now
+        if wait > retry_after then
+            retry_after = wait
+        end
+    end
+end
+if retry_after > 0 then
+    return retry_after
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
 STATUS_ALL_KEY = "statuses:all"
 USER_KEY = "user:{user_id}"
 TOKEN_KEY = "user:{user_id}:token:{jti}"
+SESSIONS_KEY = "user:{user_id}:sessions"
+LOGIN_USERNAME_KEY = "ratelimit:login:username:{username}"
+LOGIN_IP_KEY = "ratelimit:login:ip:{ip}"
+TASK_KEY = "task:{task_id}:user:{user_id}:{generation}"
+TASK_GENERATION_KEY = "user:{user_id}:tasks:generation"
+TASK_LIST_KEY = "user:{user_id}:tasks:{generation}:{filters_hash}"
 
 
 class CacheRepository:
@@ -10,6 +81,11 @@ class CacheRepository:
 
     def __init__(self, redis: Redis):
         self.redis = redis
+        # Lua-скрипты регистрируются один раз: объект скрипта хранит SHA
+        # и вызывается через EVALSHA.
+        self._revoke_sessions = redis.register_script(REVOKE_SESSIONS_SCRIPT)
+        self._rotate_session = redis.register_script(ROTATE_SESSION_SCRIPT)
+        self._sliding_window = redis.register_script(SLIDING_WINDOW_SCRIPT)
 
     async def get(self, key: str) -> str | None:
         """Получить из кеша."""
@@ -23,14 +99,109 @@ class CacheRepository:
         """Удалить из кеша."""
         await self.redis.delete(key)
 
-    async def delete_by_pattern(self, pattern: str) -> None:
-        """Удалить все ключи по паттерну."""
-        keys = []
-        async for key in self.redis.scan_iter(pattern):
-            keys.append(key)
+    async def delete_many(self, keys: list[str]) -> None:
+        """Удалить несколько ключей одним запросом."""
         if keys:
             await self.redis.delete(*keys)
 
+    async def incr(self, key: str, ttl: int) -> int:
+        """Увеличить счетчик и продлить его TTL одним pipeline-запросом."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            value, _ = await pipe.execute()
+        return value
+
+    async def add_session(
+        self, user_id: int, jti: str, ttl: int, token: str
+    ) -> None:
+        """Сохраняет refresh-токен и добавляет его JTI в индекс сессий."""
+        sessions_key = self.key_sessions(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.setex(self.key_token(user_id, jti), ttl, token)
+            pipe.sadd(sessions_key, jti)
+            pipe.expire(sessions_key, ttl)
+            await pipe.execute()
+
+    async def rotate_session(
+        self, user_id: int, old_jti: str, new_jti: str, ttl: int, token: str
+    ) -> bool:
+        """
+        Гасит старый refresh-токен и регистрирует новый за один запрос.
+
+        Возвращает False, если старый токен уже отозван, использован
+        или отсутствует в индексе сессий.
+        """
+        rotated = await self._rotate_session(
+            keys=[
+                self.key_token(user_id, old_jti),
+                self.key_token(user_id, new_jti),
+                self.key_sessions(user_id),
+            ],
+            args=[old_jti, new_jti, ttl, token],
+        )
+        return bool(rotated)
+
+    async def revoke_sessions(self, user_id: int) -> int:
+        """
+        Отзывает все refresh-токены пользователя.
+
+        Стоимость O(число сессий пользователя), без SCAN по всем ключам.
+        """
+        sessions_key = self.key_sessions(user_id)
+        jtis = list(await self.redis.smembers(sessions_key))
+        if not jtis:
+            return 0
+
+        # JTI, добавленные после SMEMBERS (новый вход), остаются в индексе.
+        return await self._revoke_sessions(
+            keys=[sessions_key, *(self.key_token(user_id, jti) for jti in jtis)],
+            args=jtis,
+        )
+
+    async def get_sessions(self, user_id: int) -> dict[str, int]:
+        """
+        Возвращает активные сессии пользователя: {jti: оставшийся TTL}.
+
+        JTI истекших токенов удаляются из индекса.
+        """
+        sessions_key = self.key_sessions(user_id)
+        jtis = sorted(await self.redis.smembers(sessions_key))
+        if not jtis:
+            return {}
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for jti in jtis:
+                pipe.ttl(self.key_token(user_id, jti))
+            ttls = await pipe.execute()
+
+        sessions = {jti: ttl for jti, ttl in zip(jtis, ttls) if ttl > 0}
+        expired = [jti for jti in jtis if jti not in sessions]
+        if expired:
+            await self.redis.srem(sessions_key, *expired)
+        return sessions
+
+    async def hit_rate_limit(
+        self, limits: dict[str, int], window: int
+    ) -> int:
+        """
+        Засчитывает попытку в скользящих окнах (атомарно, одним запросом).
+
+        limits: {ключ окна: лимит попыток за window секунд}.
+        Возвращает 0, если попытка разрешена, иначе секунды до
+        освобождения окна.
+        """
+        retry_after_ms = await self._sliding_window(
+            keys=list(limits),
+            args=[
+                int(time.time() * 1000),
+                window * 1000,
+                uuid.uuid4().hex,
+                *limits.values(),
+            ],
+        )
+        return -(-int(retry_after_ms) // 1000)  # округление вверх
+
     @property
     def key_all_statuses(self) -> str:
         return STATUS_ALL_KEY
@@ -42,3 +213,31 @@ class CacheRepository:
     @staticmethod
     def key_token(user_id: int, jti: str) -> str:
         return TOKEN_KEY.format(user_id=user_id, jti=jti)
+
+    @staticmethod
+    def key_task(task_id: int, user_id: int, generation: str) -> str:
+        return TASK_KEY.format(
+            task_id=task_id, user_id=user_id, generation=generation
+        )
+
+    @staticmethod
+    def key_task_generation(user_id: int) -> str:
+        return TASK_GENERATION_KEY.format(user_id=user_id)
+
+    @staticmethod
+    def key_task_list(user_id: int, generation: str, filters_hash: str) -> str:
+        return TASK_LIST_KEY.format(
+            user_id=user_id, generation=generation, filters_hash=filters_hash
+        )
+
+    @staticmethod
+    def key_sessions(user_id: int) -> str:
+        return SESSIONS_KEY.format(user_id=user_id)
+
+    @staticmethod
+    def key_login_username(username: str) -> str:
+        return LOGIN_USERNAME_KEY.format(username=username.lower())
+
+    @staticmethod
+    def key_login_ip(ip: str) -> str:
+        return LOGIN_IP_KEY.format(ip=ip)
@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+CACHE_INVALIDATE_CHANNEL = "cache:invalidate"
+
+
+class LocalCache:
+    """
+    In-process кеш с TTL и ограничением размера (L1 перед Redis).
+
+    Каждая реплика API держит свою копию, поэтому инвалидация
+    рассылается всем репликам через event bus
+    (канал CACHE_INVALIDATE_CHANNEL).
+    """
+    _registry: dict[str, "LocalCache"] = {}
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        LocalCache._registry[name] = self
+
+    def get(self, key: str) -> Any | None:
+        """Получить из кеша (None, если нет или истек)."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Сохранить в кеш, вытесняя самые старые ключи при переполнении."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Удалить из кеша."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистить кеш."""
+        self._data.clear()
+
+    @classmethod
+    def clear_all(cls) -> None:
+        """Очистить все in-process кеши."""
+        for cache in cls._registry.values():
+            cache.clear()
+
+    @staticmethod
+    def invalidation_event(cache_name: str, key: str) -> dict:
+        """Payload события инвалидации для event bus."""
+        return {"cache": cache_name, "key": key}
+
+    @classmethod
+    async def handle_invalidation(cls, data: dict) -> None:
+        """Обработчик события инвалидации из event bus."""
+        cache = cls._registry.get(data.get("cache", ""))
+        if cache is not None:
+            cache.delete(data["key"])
+
+
+# Почти статичные справочники (статусы и т.п.).
+reference_cache = LocalCache("reference", ttl=300)
+
+# Пользователи (principal) для get_current_user, перед Redis-кешем user:{id}.
+user_cache = LocalCache("users", ttl=30, maxsize=10000)
@@ -8,6 +8,8 @@ class DocumentCreateDTO(BaseModel):
     name: str
     path: str
     task_id: int
+    digest: str | None = None
+    size: int | None = None
 
 
 class DocumentDTO(BaseModel):
@@ -15,6 +17,23 @@ class DocumentDTO(BaseModel):
     id: int
     name: str
     path: str
+    digest: str | None = None
+
+
+class DeletedDocumentDTO(DocumentDTO):
+    """
+    DTO для удаленного документа (с ID задачи).
+
+    remaining_refs — сколько документов еще ссылаются на тот же блоб.
+    """
+    task_id: int
+    remaining_refs: int = 0
+
+
+class DocumentFileDTO(BaseModel):
+    """DTO для файла документа, который нужно освободить после удаления."""
+    path: str
+    digest: str | None = None
 
 
 class StatusDTO(BaseModel):
@@ -57,6 +76,11 @@ class TaskResponseDTO(BaseModel):
     documents: list[DocumentDTO] = Field(default_factory=list)
 
 
+class TaskSearchResultDTO(TaskResponseDTO):
+    """DTO для задачи, найденной полнотекстовым поиском."""
+    rank: float
+
+
 class TaskUpdateDTO(BaseModel):
     """DTO для изменения задачи."""
     name: str | None = None
@@ -64,3 +88,14 @@ class TaskUpdateDTO(BaseModel):
     deadline_start: datetime.date | None = None
     deadline_end: datetime.date | None = None
     status_id: int | None = None
+
+
+class TaskBulkUpdateDTO(TaskUpdateDTO):
+    """DTO для изменения задачи в пакетном запросе."""
+    id: int
+
+
+class TaskCursorDTO(BaseModel):
+    """DTO для позиции keyset-пагинации (последняя задача страницы)."""
+    value: int | float | str | datetime.date | None
+    id: int
@@ -0,0 +1,132 @@
+import base64
+import binascii
+import datetime
+import json
+import math
+
+from src.exception.exceptions import InvalidCursorException
+from src.model.filters import TaskFilterParams
+from src.repository.tasks.dto import (
+    TaskCursorDTO, TaskResponseDTO, TaskSearchResultDTO
+)
+
+DATE_ORDER_FIELDS = ("deadline_start", "deadline_end")
+SEARCH_ORDER_BY = "rank"
+SEARCH_ORDER_DIRECTION = "desc"
+BIGINT_MIN = -2 ** 63
+BIGINT_MAX = 2 ** 63 - 1
+
+
+def _encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
+
+
+def _decode_cursor(
+    cursor: str, order_by: str, order_direction: str
+) -> dict:
+    """Декодирует курсор и проверяет, что он выдан для той же сортировки."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if (
+            payload["order_by"] != order_by
+            or payload["order_direction"] != order_direction
+        ):
+            raise InvalidCursorException(cursor)
+        return payload
+    except (
+        binascii.Error, UnicodeDecodeError,
+        KeyError, TypeError, ValueError
+    ):
+        raise InvalidCursorException(cursor) from None
+
+
+def _is_bigint(value) -> bool:
+    return (
+        isinstance(value, int) and not isinstance(value, bool)
+        and BIGINT_MIN <= value <= BIGINT_MAX
+    )
+
+
+def encode_task_cursor(
+    task: TaskResponseDTO, filters: TaskFilterParams
+) -> str:
+    """Кодирует позицию задачи в непрозрачный курсор."""
+    if filters.order_by == "status_id":
+        value = task.status.id if task.status else None
+    else:
+        value = getattr(task, filters.order_by)
+
+    if isinstance(value, datetime.date):
+        value = value.isoformat()
+
+    return _encode_cursor({
+        "order_by": filters.order_by,
+        "order_direction": filters.order_direction,
+        "value": value,
+        "id": task.id,
+    })
+
+
+def decode_task_cursor(filters: TaskFilterParams) -> TaskCursorDTO:
+    """
+    Декодирует курсор из фильтров.
+
+    Курсор валиден только для той же сортировки, с которой он был выдан.
+    Тип value проверяется по колонке сортировки: поддельный курсор
+    с неподходящим значением дает 400, а не ошибку драйвера БД.
+    """
+    cursor = filters.cursor or ""
+    payload = _decode_cursor(
+        cursor, filters.order_by, filters.order_direction
+    )
+    try:
+        value = payload["value"]
+        if not _is_bigint(payload["id"]):
+            raise ValueError("id")
+
+        if value is None:
+            # name и id не бывают NULL.
+            valid = filters.order_by in (*DATE_ORDER_FIELDS, "status_id")
+        elif filters.order_by in DATE_ORDER_FIELDS:
+            value = datetime.date.fromisoformat(value)
+            valid = True
+        elif filters.order_by == "name":
+            valid = isinstance(value, str)
+        else:
+            valid = _is_bigint(value)
+        if not valid:
+            raise ValueError("value")
+
+        return TaskCursorDTO(value=value, id=payload["id"])
+    except (KeyError, TypeError, ValueError):
+        raise InvalidCursorException(cursor) from None
+
+
+def encode_search_cursor(task: TaskSearchResultDTO) -> str:
+    """Кодирует позицию результата поиска (ранг + id) в курсор."""
+    return _encode_cursor({
+        "order_by": SEARCH_ORDER_BY,
+        "order_direction": SEARCH_ORDER_DIRECTION,
+        "value": task.rank,
+        "id": task.id,
+    })
+
+
+def decode_search_cursor(cursor: str) -> TaskCursorDTO:
+    """Декодирует курсор результата поиска."""
+    payload = _decode_cursor(
+        cursor, SEARCH_ORDER_BY, SEARCH_ORDER_DIRECTION
+    )
+    try:
+        value = payload["value"]
+        if (
+            not isinstance(value, (int, float)) or isinstance(value, bool)
+            or not math.isfinite(value) or not _is_bigint(payload["id"])
+        ):
+            raise ValueError("value")
+
+        return TaskCursorDTO(value=float(value), id=payload["id"])
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise InvalidCursorException(cursor) from None
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy import text
@@ -9,12 +10,16 @@ from src.exception.exceptions import (
     ResourceByIdNotFoundException,
     ResourceNotCreatedException
 )
-from src.model.filters import TaskFilterParams
+from src.model.filters import TaskFilterParams, TaskSearchParams
 from src.repository.tasks.dto import (
-    DocumentCreateDTO, DocumentDTO,
+    DeletedDocumentDTO, DocumentCreateDTO, DocumentDTO, DocumentFileDTO,
     StatusDTO,
     TagCreateDTO, TagResponseDTO,
-    TaskCreateDTO, TaskResponseDTO, TaskUpdateDTO
+    TaskBulkUpdateDTO, TaskCreateDTO, TaskCursorDTO, TaskResponseDTO,
+    TaskSearchResultDTO, TaskUpdateDTO
+)
+from src.repository.tasks.pagination import (
+    decode_search_cursor, decode_task_cursor
 )
 
 
@@ -38,24 +43,64 @@ class TaskRepository:
         - check_task_ownership: проверка принадлежности задачи пользователю
         - create_task: создание задачи
         - get_all_tasks: получение задач пользователя
+        - search_tasks: полнотекстовый поиск задач пользователя
+        - stream_tasks: потоковое получение всех задач пользователя
         - get_task_by_id: получение задачи по ID
         - update_task: обновление задачи
         - delete_task: удаление задачи
+        - get_tasks_by_ids: получение нескольких задач по ID
+        - bulk_create_tasks: пакетное создание задач
+        - bulk_update_tasks: пакетное обновление задач
+        - bulk_delete_tasks: пакетное удаление задач
 
     TaskTag:
         - get_task_tags: получение тегов задачи
+        - get_tags_by_task_ids: получение тегов нескольких задач
         - add_tag_to_task: добавление тега к задаче
         - remove_tag_from_task: удаление тега у задачи
 
     Document:
         - create_document: создание документа
         - get_task_documents: получение документов задачи
+        - get_document: получение документа пользователя по ID
+        - get_documents_by_task_ids: получение документов нескольких задач
         - delete_document: удаление документа
     """
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def _row_to_task(
+        row,
+        tags: list[TagResponseDTO] | None = None,
+        documents: list[DocumentDTO] | None = None,
+        dto_class: type[TaskResponseDTO] = TaskResponseDTO,
+        **extra: Any,
+    ) -> TaskResponseDTO:
+        """
+        Собирает DTO задачи из строки task с присоединенным статусом
+        (колонки status_id, status_name).
+        """
+        status_dto = None
+        if row.status_id:
+            status_dto = StatusDTO(
+                id=row.status_id,
+                name=row.status_name
+            )
+
+        return dto_class(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            deadline_start=row.deadline_start,
+            deadline_end=row.deadline_end,
+            status=status_dto,
+            tags=tags or [],
+            documents=documents or [],
+            **extra
+        )
+
     # ===== Status =====
 
     async def get_all_statuses(self) -> list[StatusDTO]:
@@ -92,6 +137,25 @@ class TaskRepository:
             name=row.name
         )
 
+    async def _get_missing_status_ids(
+        self, status_ids: list[int | None]
+    ) -> set[int]:
+        """
+        Возвращает те из status_ids, которых нет в таблице status
+        (одним запросом, None пропускаются).
+        """
+        ids = list({status_id for status_id in status_ids if status_id})
+        if not ids:
+            return set()
+
+        query = text("""
+            SELECT id
+            FROM status
+            WHERE id = ANY(CAST(:ids AS bigint[]))
+        """)
+        result = await self.session.execute(query, {"ids": ids})
+        return set(ids) - {row.id for row in result.fetchall()}
+
     # ===== Tag =====
 
     async def create_tag(self, data: TagCreateDTO) -> TagResponseDTO:
@@ -175,27 +239,42 @@ class TaskRepository:
         if not row:
             raise ResourceNotCreatedException("Задачу")
 
-        # Формируем статус, если он есть
-        status_dto = None
-        if row.status_id:
-            status_dto = StatusDTO(
-                id=row.status_id,
-                name=row.status_name
-            )
-
-        return TaskResponseDTO(
-            id=row.id,
-            name=row.name,
-            description=row.description,
-            deadline_start=row.deadline_start,
-            deadline_end=row.deadline_end,
-            status=status_dto
-        )
+        return self._row_to_task(row)
 
     async def get_all_tasks(
         self, filters: TaskFilterParams, user_id: int
     ) -> list[TaskResponseDTO]:
-        """Получает задачи пользователя с фильтрами."""
+        """
+        Получает задачи пользователя с фильтрами.
+
+        Если передан курсор, страница выбирается по keyset-условию
+        (после последней задачи предыдущей страницы), а offset игнорируется.
+        """
+        conditions = ["task.user_id = :user_id"]
+        params: dict[str, Any] = {
+            "user_id": user_id,
+            "limit": filters.limit,
+            "offset": filters.offset,
+        }
+        conditions.extend(self._build_filter_conditions(filters, params))
+
+        if filters.cursor is not None:
+            cursor = decode_task_cursor(filters)
+            conditions.append(self._build_keyset_condition(filters, cursor))
+            params["cursor_id"] = cursor.id
+            if cursor.value is not None:
+                params["cursor_value"] = cursor.value
+            params["offset"] = 0
+
+        # id — уникальный тай-брейкер, без него keyset-пагинация неоднозначна.
+        if filters.order_by == "id":
+            order_clause = f"task.id {filters.order_direction}"
+        else:
+            order_clause = (
+                f"task.{filters.order_by} {filters.order_direction} "
+                f"NULLS LAST, task.id {filters.order_direction}"
+            )
+
         query = text(f"""
             SELECT
                 task.id, task.name, task.description,
@@ -203,44 +282,208 @@ class TaskRepository:
                 status.id as status_id, status.name as status_name
             FROM task
             LEFT JOIN status ON task.status_id = status.id
-            WHERE task.user_id = :user_id
-            ORDER BY task.{filters.order_by} {filters.order_direction}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {order_clause}
             LIMIT :limit OFFSET :offset
         """)
-        result = await self.session.execute(
-            query,
-            {
-                "user_id": user_id,
-                "limit": filters.limit,
-                "offset": filters.offset,
-            }
+        result = await self.session.execute(query, params)
+        rows = result.fetchall()
+
+        # Теги и документы всей страницы получаем двумя запросами.
+        task_ids = [row.id for row in rows]
+        tags_by_task = await self.get_tags_by_task_ids(task_ids, user_id)
+        documents_by_task = await self.get_documents_by_task_ids(
+            task_ids, user_id
         )
+
+        return [
+            self._row_to_task(
+                row,
+                tags_by_task.get(row.id, []),
+                documents_by_task.get(row.id, [])
+            )
+            for row in rows
+        ]
+
+    async def search_tasks(
+        self, params: TaskSearchParams, user_id: int
+    ) -> list[TaskSearchResultDTO]:
+        """
+        Полнотекстовый поиск задач пользователя по названию и описанию.
+
+        Результаты упорядочены по ts_rank (по убыванию), затем по id.
+        """
+        conditions = [
+            "task.user_id = :user_id",
+            "task.search_vector @@ search_query",
+        ]
+        sql_params: dict[str, Any] = {
+            "user_id": user_id,
+            "q": params.q,
+            "limit": params.limit,
+            "offset": params.offset,
+        }
+
+        if params.cursor is not None:
+            cursor = decode_search_cursor(params.cursor)
+            conditions.append("""(
+                ts_rank(task.search_vector, search_query) < :cursor_rank
+                OR (
+                    ts_rank(task.search_vector, search_query) = :cursor_rank
+                    AND task.id < :cursor_id
+                )
+            )""")
+            sql_params["cursor_rank"] = cursor.value
+            sql_params["cursor_id"] = cursor.id
+            sql_params["offset"] = 0
+
+        query = text(f"""
+            SELECT
+                task.id, task.name, task.description,
+                task.deadline_start, task.deadline_end,
+                status.id as status_id, status.name as status_name,
+                ts_rank(task.search_vector, search_query) AS rank
+            FROM task
+            CROSS JOIN websearch_to_tsquery('russian', :q) AS search_query
+            LEFT JOIN status ON task.status_id = status.id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY rank DESC, task.id DESC
+            LIMIT :limit OFFSET :offset
+        """)
+        result = await self.session.execute(query, sql_params)
         rows = result.fetchall()
 
-        tasks = []
-        for row in rows:
-            status_dto = None
-            if row.status_id:
-                status_dto = StatusDTO(
-                    id=row.status_id,
-                    name=row.status_name
+        task_ids = [row.id for row in rows]
+        tags_by_task = await self.get_tags_by_task_ids(task_ids, user_id)
+        documents_by_task = await self.get_documents_by_task_ids(
+            task_ids, user_id
+        )
+
+        return [
+            self._row_to_task(
+                row,
+                tags_by_task.get(row.id, []),
+                documents_by_task.get(row.id, []),
+                dto_class=TaskSearchResultDTO,
+                rank=row.rank
+            )
+            for row in rows
+        ]
+
+    async def stream_tasks(
+        self, user_id: int, chunk_size: int
+    ) -> AsyncIterator[list[TaskResponseDTO]]:
+        """
+        Потоково отдает все задачи пользователя пачками по chunk_size.
+
+        Строки читаются серверным курсором, теги и документы
+        подгружаются отдельными запросами на каждую пачку.
+        """
+        query = text("""
+            SELECT
+                task.id, task.name, task.description,
+                task.deadline_start, task.deadline_end,
+                status.id as status_id, status.name as status_name
+            FROM task
+            LEFT JOIN status ON task.status_id = status.id
+            WHERE task.user_id = :user_id
+            ORDER BY task.id
+        """)
+        result = await self.session.stream(
+            query,
+            {"user_id": user_id},
+            execution_options={"yield_per": chunk_size},
+        )
+
+        async for rows in result.partitions(chunk_size):
+            task_ids = [row.id for row in rows]
+            tags_by_task = await self.get_tags_by_task_ids(task_ids, user_id)
+            documents_by_task = await self.get_documents_by_task_ids(
+                task_ids, user_id
+            )
+
+            yield [
+                self._row_to_task(
+                    row,
+                    tags_by_task.get(row.id, []),
+                    documents_by_task.get(row.id, [])
                 )
+                for row in rows
+            ]
+
+    @staticmethod
+    def _build_filter_conditions(
+        filters: TaskFilterParams, params: dict[str, Any]
+    ) -> list[str]:
+        """
+        Формирует условия WHERE для фильтров списка задач.
+
+        Значения фильтров добавляются в params.
+        """
+        conditions = []
+
+        if filters.status_id is not None:
+            conditions.append("task.status_id = :status_id")
+            params["status_id"] = filters.status_id
+
+        if filters.tag_id:
+            tag_ids = sorted(set(filters.tag_id))
+            params["tag_ids"] = tag_ids
+            if filters.tag_match == "all":
+                conditions.append("""task.id IN (
+                    SELECT tasktag.task_id FROM tasktag
+                    WHERE tasktag.tag_id = ANY(:tag_ids)
+                    GROUP BY tasktag.task_id
+                    HAVING count(*) = :tag_count
+                )""")
+                params["tag_count"] = len(tag_ids)
+            else:
+                conditions.append("""task.id IN (
+                    SELECT tasktag.task_id FROM tasktag
+                    WHERE tasktag.tag_id = ANY(:tag_ids)
+                )""")
+
+        if filters.deadline_after is not None:
+            conditions.append("task.deadline_end >= :deadline_after")
+            params["deadline_after"] = filters.deadline_after
+
+        if filters.deadline_before is not None:
+            conditions.append("task.deadline_end <= :deadline_before")
+            params["deadline_before"] = filters.deadline_before
+
+        if filters.overdue is True:
+            conditions.append("task.deadline_end < CURRENT_DATE")
+        elif filters.overdue is False:
+            conditions.append(
+                "(task.deadline_end IS NULL "
+                "OR task.deadline_end >= CURRENT_DATE)"
+            )
 
-            tags = await self.get_task_tags(row.id, user_id)
-            documents = await self.get_task_documents(row.id, user_id)
+        return conditions
 
-            tasks.append(TaskResponseDTO(
-                id=row.id,
-                name=row.name,
-                description=row.description,
-                deadline_start=row.deadline_start,
-                deadline_end=row.deadline_end,
-                status=status_dto,
-                tags=tags,
-                documents=documents
-            ))
+    @staticmethod
+    def _build_keyset_condition(
+        filters: TaskFilterParams, cursor: TaskCursorDTO
+    ) -> str:
+        """
+        Формирует условие "строго после курсора" для текущей сортировки.
 
-        return tasks
+        NULL-значения всегда идут в конце страницы (NULLS LAST).
+        """
+        op = "<" if filters.order_direction == "desc" else ">"
+
+        if filters.order_by == "id":
+            return f"task.id {op} :cursor_id"
+
+        column = f"task.{filters.order_by}"
+        if cursor.value is None:
+            return f"({column} IS NULL AND task.id {op} :cursor_id)"
+
+        return (
+            f"({column} {op} :cursor_value"
+            f" OR ({column} = :cursor_value AND task.id {op} :cursor_id)"
+            f" OR {column} IS NULL)"
+        )
 
     async def check_task_ownership(
         self, task_id: int, user_id: int
@@ -279,62 +522,81 @@ class TaskRepository:
         if not row:
             raise ResourceByIdNotFoundException("Задача", task_id)
 
-        status_dto = None
-        if row.status_id:
-            status_dto = StatusDTO(
-                id=row.status_id,
-                name=row.status_name
-            )
-
         tags = await self.get_task_tags(task_id, user_id)
         documents = await self.get_task_documents(task_id, user_id)
 
-        return TaskResponseDTO(
-            id=row.id,
-            name=row.name,
-            description=row.description,
-            deadline_start=row.deadline_start,
-            deadline_end=row.deadline_end,
-            status=status_dto,
-            tags=tags,
-            documents=documents
-        )
+        return self._row_to_task(row, tags, documents)
 
     async def update_task(
         self, task_id: int, data: TaskUpdateDTO, user_id: int
     ) -> TaskResponseDTO:
-        """Обновляет задачу (только если принадлежит пользователю)."""
-        async with self.session.begin():
-            # Формируем список только с теми полями, которые переданы
-            update_fields = []
-            params: dict[str, Any] = {"id": task_id, "user_id": user_id}
-
-            if data.name is not None:
-                update_fields.append("name = :name")
-                params["name"] = data.name
-            if data.description is not None:
-                update_fields.append("description = :description")
-                params["description"] = data.description
-            if data.deadline_start is not None:
-                update_fields.append("deadline_start = :deadline_start")
-                params["deadline_start"] = data.deadline_start
-            if data.deadline_end is not None:
-                update_fields.append("deadline_end = :deadline_end")
-                params["deadline_end"] = data.deadline_end
-            if data.status_id is not None:
-                update_fields.append("status_id = :status_id")
-                params["status_id"] = data.status_id
-
-            if not update_fields:
-                return await self.get_task_by_id(
-                    task_id, user_id
-                )
+        """
+        Обновляет задачу (только если принадлежит пользователю).
+
+        UPDATE ... RETURNING обернут в CTE, к которому сразу присоединяются
+        статус, теги и документы: задача возвращается одним запросом.
+        """
+        # Формируем список только с теми полями, которые переданы
+        update_fields = []
+        params: dict[str, Any] = {"id": task_id, "user_id": user_id}
+
+        if data.name is not None:
+            update_fields.append("name = :name")
+            params["name"] = data.name
+        if data.description is not None:
+            update_fields.append("description = :description")
+            params["description"] = data.description
+        if data.deadline_start is not None:
+            update_fields.append("deadline_start = :deadline_start")
+            params["deadline_start"] = data.deadline_start
+        if data.deadline_end is not None:
+            update_fields.append("deadline_end = :deadline_end")
+            params["deadline_end"] = data.deadline_end
+        if data.status_id is not None:
+            update_fields.append("status_id = :status_id")
+            params["status_id"] = data.status_id
+
+        # Менять нечего: транзакция не нужна, просто читаем задачу.
+        if not update_fields:
+            return await self.get_task_by_id(task_id, user_id)
 
+        async with self.session.begin():
             query = text(f"""
-                UPDATE task
-                SET {', '.join(update_fields)}
-                WHERE id = :id AND user_id = :user_id
-                RETURNING id
+                WITH updated_task AS (
+                    UPDATE task
+                    SET {', '.join(update_fields)}
+                    WHERE id = :id AND user_id = :user_id
+                    RETURNING id, name, description, deadline_start,
+                        deadline_end, status_id
+                )
+                SELECT
+                    updated_task.id, updated_task.name,
+                    updated_task.description,
+                    updated_task.deadline_start, updated_task.deadline_end,
+                    status.id as status_id, status.name as status_name,
+                    COALESCE((
+                        SELECT json_agg(
+                            json_build_object('id', tag.id, 'name', tag.name)
+                            ORDER BY tag.id
+                        )
+                        FROM tasktag
+                        INNER JOIN tag ON tag.id = tasktag.tag_id
+                        WHERE tasktag.task_id = updated_task.id
+                    ), '[]'::json) AS tags,
+                    COALESCE((
+                        SELECT json_agg(
+                            json_build_object(
+                                'id', document.id,
+                                'name', document.name,
+                                'path', document.path
+                            )
+                            ORDER BY document.id
+                        )
+                        FROM document
+                        WHERE document.task_id = updated_task.id
+                    ), '[]'::json) AS documents
+                FROM updated_task
+                LEFT JOIN status ON updated_task.status_id = status.id
             """)
             result = await self.session.execute(query, params)
             row = result.fetchone()
@@ -342,26 +604,283 @@ class TaskRepository:
         if not row:
             raise ResourceByIdNotFoundException("Задача", task_id)
 
-        return await self.get_task_by_id(task_id, user_id)
+        return self._row_to_task(
+            row,
+            [TagResponseDTO(**tag) for tag in row.tags],
+            [DocumentDTO(**doc) for doc in row.documents]
+        )
 
     async def delete_task(
         self, task_id: int, user_id: int
-    ) -> None:
-        """Удаляет задачу (только если принадлежит пользователю)."""
+    ) -> list[DocumentFileDTO]:
+        """
+        Удаляет задачу (только если принадлежит пользователю).
+
+        Документы удаляются каскадно; возвращаются их файлы, чтобы
+        вызывающий код мог их освободить.
+        """
         async with self.session.begin():
+            # CTE видит документы до каскадного удаления.
             query = text("""
-                DELETE FROM task
-                WHERE id = :id AND user_id = :user_id
-                RETURNING id
+                WITH deleted AS (
+                    DELETE FROM task
+                    WHERE id = :id AND user_id = :user_id
+                    RETURNING id
+                )
+                SELECT deleted.id, document.path, document.digest
+                FROM deleted
+                LEFT JOIN document ON document.task_id = deleted.id
             """)
             result = await self.session.execute(
                 query, {"id": task_id, "user_id": user_id}
             )
-            row = result.fetchone()
+            rows = result.fetchall()
 
-        if not row:
+        if not rows:
             raise ResourceByIdNotFoundException("Задача", task_id)
 
+        return [
+            DocumentFileDTO(path=row.path, digest=row.digest)
+            for row in rows if row.path is not None
+        ]
+
+    async def get_tasks_by_ids(
+        self, task_ids: list[int], user_id: int
+    ) -> list[TaskResponseDTO]:
+        """
+        Получает несколько задач по ID (только принадлежащие пользователю).
+
+        Порядок задач совпадает с порядком task_ids.
+        """
+        if not task_ids:
+            return []
+
+        query = text("""
+            SELECT
+                task.id, task.name, task.description,
+                task.deadline_start, task.deadline_end,
+                status.id as status_id, status.name as status_name
+            FROM task
+            LEFT JOIN status ON task.status_id = status.id
+            WHERE task.id = ANY(:task_ids) AND task.user_id = :user_id
+        """)
+        result = await self.session.execute(
+            query, {"task_ids": task_ids, "user_id": user_id}
+        )
+        rows = {row.id: row for row in result.fetchall()}
+
+        tags_by_task = await self.get_tags_by_task_ids(task_ids, user_id)
+        documents_by_task = await self.get_documents_by_task_ids(
+            task_ids, user_id
+        )
+
+        return [
+            self._row_to_task(
+                rows[task_id],
+                tags_by_task.get(task_id, []),
+                documents_by_task.get(task_id, [])
+            )
+            for task_id in task_ids if task_id in rows
+        ]
+
+    async def bulk_create_tasks(
+        self, data: list[TaskCreateDTO]
+    ) -> list[TaskResponseDTO | None]:
+        """
+        Создает несколько задач одним INSERT в одной транзакции.
+
+        Статусы пакета проверяются одним запросом: задачи с
+        несуществующим status_id не создаются (иначе внешний ключ
+        откатил бы весь пакет). Возвращает список той же длины, что
+        data: созданную задачу или None, если ее статуса нет.
+
+        Строки сопоставляются с data по номеру элемента (WITH ORDINALITY),
+        а не по порядку выдачи id последовательностью.
+        """
+        if not data:
+            return []
+
+        async with self.session.begin():
+            missing_status_ids = await self._get_missing_status_ids(
+                [item.status_id for item in data]
+            )
+            # Индексы в data задач, которые будут созданы.
+            indexes = [
+                i for i, item in enumerate(data)
+                if item.status_id not in missing_status_ids
+            ]
+            tasks: list[TaskResponseDTO | None] = [None] * len(data)
+            if not indexes:
+                return tasks
+
+            valid = [data[i] for i in indexes]
+            # id выделяются заранее: RETURNING видит только колонки task,
+            # а ordinal нужен, чтобы связать строку с элементом data.
+            query = text("""
+                WITH input AS (
+                    SELECT
+                        nextval(pg_get_serial_sequence('task', 'id')) AS id,
+                        v.*
+                    FROM unnest(
+                        CAST(:names AS varchar[]),
+                        CAST(:descriptions AS varchar[]),
+                        CAST(:deadline_starts AS date[]),
+                        CAST(:deadline_ends AS date[]),
+                        CAST(:status_ids AS bigint[]),
+                        CAST(:user_ids AS bigint[])
+                    ) WITH ORDINALITY AS v(
+                        name, description, deadline_start,
+                        deadline_end, status_id, user_id, ordinal
+                    )
+                ),
+                new_task AS (
+                    INSERT INTO task (
+                        id, name, description, deadline_start,
+                        deadline_end, status_id, user_id
+                    )
+                    SELECT
+                        id, name, description, deadline_start,
+                        deadline_end, status_id, user_id
+                    FROM input
+                    RETURNING id, name, description, deadline_start,
+                        deadline_end, status_id
+                )
+                SELECT
+                    new_task.id, new_task.name, new_task.description,
+                    new_task.deadline_start, new_task.deadline_end,
+                    status.id as status_id, status.name as status_name,
+                    input.ordinal
+                FROM new_task
+                INNER JOIN input ON input.id = new_task.id
+                LEFT JOIN status ON new_task.status_id = status.id
+            """)
+            result = await self.session.execute(
+                query,
+                {
+                    "names": [item.name for item in valid],
+                    "descriptions": [item.description for item in valid],
+                    "deadline_starts": [
+                        item.deadline_start for item in valid
+                    ],
+                    "deadline_ends": [item.deadline_end for item in valid],
+                    "status_ids": [item.status_id for item in valid],
+                    "user_ids": [item.user_id for item in valid],
+                }
+            )
+            rows = result.fetchall()
+
+        if len(rows) != len(valid):
+            raise ResourceNotCreatedException("Задачи")
+
+        for row in rows:
+            tasks[indexes[row.ordinal - 1]] = self._row_to_task(row)
+        return tasks
+
+    async def bulk_update_tasks(
+        self, data: list[TaskBulkUpdateDTO], user_id: int
+    ) -> tuple[list[TaskResponseDTO], set[int]]:
+        """
+        Обновляет несколько задач одним UPDATE в одной транзакции.
+
+        Как и в update_task, поля со значением None не меняются.
+        Задачи, не принадлежащие пользователю, пропускаются. Статусы
+        пакета проверяются одним запросом: задачи с несуществующим
+        status_id не обновляются (иначе внешний ключ откатил бы весь
+        пакет). Возвращает обновленные задачи и множество
+        несуществующих status_id.
+        """
+        if not data:
+            return [], set()
+
+        async with self.session.begin():
+            missing_status_ids = await self._get_missing_status_ids(
+                [item.status_id for item in data]
+            )
+            data = [
+                item for item in data
+                if item.status_id not in missing_status_ids
+            ]
+            if not data:
+                return [], missing_status_ids
+
+            query = text("""
+                UPDATE task
+                SET
+                    name = COALESCE(v.name, task.name),
+                    description = COALESCE(v.description, task.description),
+                    deadline_start = COALESCE(
+                        v.deadline_start, task.deadline_start
+                    ),
+                    deadline_end = COALESCE(v.deadline_end, task.deadline_end),
+                    status_id = COALESCE(v.status_id, task.status_id)
+                FROM unnest(
+                    CAST(:ids AS bigint[]),
+                    CAST(:names AS varchar[]),
+                    CAST(:descriptions AS varchar[]),
+                    CAST(:deadline_starts AS date[]),
+                    CAST(:deadline_ends AS date[]),
+                    CAST(:status_ids AS bigint[])
+                ) AS v(
+                    id, name, description,
+                    deadline_start, deadline_end, status_id
+                )
+                WHERE task.id = v.id AND task.user_id = :user_id
+                RETURNING task.id
+            """)
+            result = await self.session.execute(
+                query,
+                {
+                    "ids": [item.id for item in data],
+                    "names": [item.name for item in data],
+                    "descriptions": [item.description for item in data],
+                    "deadline_starts": [item.deadline_start for item in data],
+                    "deadline_ends": [item.deadline_end for item in data],
+                    "status_ids": [item.status_id for item in data],
+                    "user_id": user_id,
+                }
+            )
+            updated_ids = {row.id for row in result.fetchall()}
+
+        tasks = await self.get_tasks_by_ids(
+            [item.id for item in data if item.id in updated_ids], user_id
+        )
+        return tasks, missing_status_ids
+
+    async def bulk_delete_tasks(
+        self, task_ids: list[int], user_id: int
+    ) -> tuple[list[int], list[DocumentFileDTO]]:
+        """
+        Удаляет несколько задач одним DELETE в одной транзакции.
+
+        Возвращает ID удаленных задач (только принадлежавших пользователю)
+        и файлы их документов, удаленных каскадно.
+        """
+        if not task_ids:
+            return [], []
+
+        async with self.session.begin():
+            query = text("""
+                WITH deleted AS (
+                    DELETE FROM task
+                    WHERE id = ANY(:task_ids) AND user_id = :user_id
+                    RETURNING id
+                )
+                SELECT deleted.id, document.path, document.digest
+                FROM deleted
+                LEFT JOIN document ON document.task_id = deleted.id
+            """)
+            result = await self.session.execute(
+                query, {"task_ids": task_ids, "user_id": user_id}
+            )
+            rows = result.fetchall()
+
+        deleted_ids = list(dict.fromkeys(row.id for row in rows))
+        files = [
+            DocumentFileDTO(path=row.path, digest=row.digest)
+            for row in rows if row.path is not None
+        ]
+        return deleted_ids, files
+
     # ===== TaskTag =====
 
     async def get_task_tags(
@@ -387,6 +906,34 @@ class TaskRepository:
             ) for row in rows
         ]
 
+    async def get_tags_by_task_ids(
+        self, task_ids: list[int], user_id: int
+    ) -> dict[int, list[TagResponseDTO]]:
+        """Получает теги сразу для нескольких задач одним запросом."""
+        if not task_ids:
+            return {}
+
+        query = text("""
+            SELECT tasktag.task_id, tag.id, tag.name
+            FROM tag
+            INNER JOIN tasktag ON tag.id = tasktag.tag_id
+            INNER JOIN task ON tasktag.task_id = task.id
+            WHERE tasktag.task_id = ANY(:task_ids) AND task.user_id = :user_id
+        """)
+        result = await self.session.execute(
+            query, {"task_ids": task_ids, "user_id": user_id}
+        )
+
+        tags: dict[int, list[TagResponseDTO]] = {}
+        for row in result.fetchall():
+            tags.setdefault(row.task_id, []).append(
+                TagResponseDTO(
+                    id=row.id,
+                    name=row.name
+                )
+            )
+        return tags
+
     async def add_tag_to_task(
         self, task_id: int, tag_id: int, user_id: int
     ) -> None:
@@ -452,14 +999,16 @@ class TaskRepository:
         async with self.session.begin():
             await self.check_task_ownership(data.task_id, user_id)
             query = text("""
-                INSERT INTO document (name, path, task_id)
-                VALUES (:name, :path, :task_id)
+                INSERT INTO document (name, path, task_id, digest, size)
+                VALUES (:name, :path, :task_id, :digest, :size)
                 RETURNING id, name, path
             """)
             result = await self.session.execute(query, {
                 "name": data.name,
                 "path": data.path,
                 "task_id": data.task_id,
+                "digest": data.digest,
+                "size": data.size,
             })
             row = result.fetchone()
 
@@ -495,18 +1044,89 @@ class TaskRepository:
             ) for row in rows
         ]
 
-    async def delete_document(
+    async def get_document(
         self, document_id: int, user_id: int
     ) -> DocumentDTO:
-        """Удаляет документ (только если задача принадлежит пользователю)."""
+        """
+        Получает документ с проверкой владельца задачи одним запросом.
+        """
+        query = text("""
+            SELECT document.id, document.name, document.path, document.digest
+            FROM document
+            INNER JOIN task ON document.task_id = task.id
+            WHERE document.id = :id AND task.user_id = :user_id
+        """)
+        result = await self.session.execute(
+            query, {"id": document_id, "user_id": user_id}
+        )
+        row = result.fetchone()
+
+        if not row:
+            raise ResourceByIdNotFoundException("Документ", document_id)
+
+        return DocumentDTO(
+            id=row.id,
+            name=row.name,
+            path=row.path,
+            digest=row.digest
+        )
+
+    async def get_documents_by_task_ids(
+        self, task_ids: list[int], user_id: int
+    ) -> dict[int, list[DocumentDTO]]:
+        """Получает документы сразу для нескольких задач одним запросом."""
+        if not task_ids:
+            return {}
+
+        query = text("""
+            SELECT document.task_id, document.id, document.name, document.path
+            FROM document
+            INNER JOIN task ON document.task_id = task.id
+            WHERE document.task_id = ANY(:task_ids) AND task.user_id = :user_id
+        """)
+        result = await self.session.execute(
+            query, {"task_ids": task_ids, "user_id": user_id}
+        )
+
+        documents: dict[int, list[DocumentDTO]] = {}
+        for row in result.fetchall():
+            documents.setdefault(row.task_id, []).append(
+                DocumentDTO(
+                    id=row.id,
+                    name=row.name,
+                    path=row.path
+                )
+            )
+        return documents
+
+    async def delete_document(
+        self, document_id: int, user_id: int
+    ) -> DeletedDocumentDTO:
+        """
+        Удаляет документ (только если задача принадлежит пользователю).
+
+        Тем же запросом считает оставшиеся ссылки на его блоб.
+        """
         async with self.session.begin():
             query = text("""
-                DELETE FROM document
-                USING task
-                WHERE document.id = :id
-                    AND document.task_id = task.id
-                    AND task.user_id = :user_id
-                RETURNING document.id, document.name, document.path
+                WITH deleted AS (
+                    DELETE FROM document
+                    USING task
+                    WHERE document.id = :id
+                        AND document.task_id = task.id
+                        AND task.user_id = :user_id
+                    RETURNING document.id, document.name, document.path,
+                        document.task_id, document.digest
+                )
+                SELECT
+                    deleted.*,
+                    (
+                        SELECT count(*)
+                        FROM document
+                        WHERE document.digest = deleted.digest
+                            AND document.id <> deleted.id
+                    ) AS remaining_refs
+                FROM deleted
             """)
             result = await self.session.execute(
                 query,
@@ -517,8 +1137,12 @@ class TaskRepository:
         if not row:
             raise ResourceByIdNotFoundException("Документ", document_id)
 
-        return DocumentDTO(
+        return DeletedDocumentDTO(
             id=row.id,
             name=row.name,
-            path=row.path
+            path=row.path,
+            task_id=row.task_id,
+            digest=row.digest,
+            remaining_refs=row.remaining_refs
         )
+
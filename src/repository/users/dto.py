@@ -24,3 +24,10 @@ class UserWithEmailAndPasswordDTO(BaseModel):
     email: str
     hashed_password: str
     role: str
+
+
+class PasswordHashParamsDTO(BaseModel):
+    """DTO для группы хешей паролей с одинаковыми параметрами."""
+    params: str
+    users: int
+    sample_hash: str
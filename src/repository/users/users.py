@@ -9,6 +9,7 @@ from src.exception.exceptions import (
     ResourceByNameNotFoundException
 )
 from src.repository.users.dto import (
+    PasswordHashParamsDTO,
     UserCreateDTO,
     UserResponseDTO,
     UserWithEmailAndPasswordDTO
@@ -26,6 +27,9 @@ class UserRepository:
         - get_user_by_user_id: получение пользователя по ID
         - create_user: создание пользователя
         - update_user_password_by_user_id: обновление пароля пользователя
+        - replace_user_password_hash: замена хеша, если он не изменился
+        - update_user_role_by_user_id: обновление роли пользователя
+        - count_users_by_hash_params: число пользователей по параметрам хеша
     """
 
     def __init__(self, session: AsyncSession):
@@ -125,3 +129,83 @@ class UserRepository:
 
             if not row:
                 raise ResourceByIdNotFoundException("Пользователь", user_id)
+
+    async def replace_user_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """
+        Заменяет хеш пароля, только если в БД все еще old_hash
+        (compare-and-set).
+
+        Возвращает False, если пароль успели сменить.
+        """
+        async with self.session.begin():
+            query = text("""
+                UPDATE "user"
+                SET password = :new_hash
+                WHERE id = :id AND password = :old_hash
+                RETURNING id
+            """)
+            result = await self.session.execute(query, {
+                "id": user_id,
+                "old_hash": old_hash,
+                "new_hash": new_hash,
+            })
+            return result.fetchone() is not None
+
+    async def update_user_role_by_user_id(
+        self, user_id: int, role: str
+    ) -> UserResponseDTO:
+        """Обновляет роль пользователя."""
+        async with self.session.begin():
+            query = text("""
+                UPDATE "user"
+                SET role = :role
+                WHERE id = :id
+                RETURNING id, username, role
+            """)
+            result = await self.session.execute(query, {
+                "id": user_id,
+                "role": role,
+            })
+            row = result.fetchone()
+
+            if not row:
+                raise ResourceByIdNotFoundException("Пользователь", user_id)
+
+            return UserResponseDTO(
+                id=row.id,
+                username=row.username,
+                role=row.role
+            )
+
+    async def count_users_by_hash_params(self) -> list[PasswordHashParamsDTO]:
+        """
+        Группирует пользователей по параметрам хеша пароля.
+
+        Хеш Argon2 имеет вид $argon2id$v=19$m=...,t=...,p=...$salt$hash,
+        параметры — это первые три поля.
+        """
+        query = text("""
+            SELECT
+                concat_ws(
+                    '$',
+                    split_part(password, '$', 2),
+                    split_part(password, '$', 3),
+                    split_part(password, '$', 4)
+                ) AS params,
+                count(*) AS users,
+                min(password) AS sample_hash
+            FROM "user"
+            GROUP BY params
+            ORDER BY users DESC
+        """)
+        result = await self.session.execute(query)
+
+        return [
+            PasswordHashParamsDTO(
+                params=row.params,
+                users=row.users,
+                sample_hash=row.sample_hash
+            ) for row in result.fetchall()
+        ]
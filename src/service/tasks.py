@@ -1,30 +1,57 @@
+import asyncio
+import csv
+import hashlib
+import io
 import json
 import logging
-import os
-import uuid
+from collections.abc import AsyncIterator
 from pathlib import Path
 
+import aiofiles.os
 from fastapi import UploadFile
 
 from src.broker.event_bus_publisher import event_bus
+from src.celery_app.document_gc import delete_document_files
+from src.core.config import settings
+from src.core.metrics import Metrics
+from src.exception.exceptions import (
+    FileTooLargeException, ResourceByIdNotFoundException
+)
 
-from src.model.filters import TaskFilterParams
+from src.model.filters import TaskFilterParams, TaskSearchParams
 from src.model.tasks import (
     DocumentResponse,
     StatusResponse,
     TagCreate, TagResponse,
+    TaskBulkCreate, TaskBulkDelete, TaskBulkResult, TaskBulkUpdate,
     TaskCreate, TaskResponse, TaskUpdate
 )
 from src.repository.tasks.dto import (
-    DocumentCreateDTO,
+    DocumentCreateDTO, DocumentFileDTO,
     TagCreateDTO,
-    TaskCreateDTO, TaskUpdateDTO
+    TaskBulkUpdateDTO, TaskCreateDTO, TaskUpdateDTO
 )
 from src.repository.cache import CacheRepository
+from src.repository.local_cache import (
+    CACHE_INVALIDATE_CHANNEL, LocalCache, reference_cache
+)
+from src.repository.tasks.pagination import (
+    encode_search_cursor, encode_task_cursor
+)
 from src.repository.tasks.tasks import TaskRepository
+from src.storage.base import BLOB_PREFIX, Storage, StoredObject
 
 logger = logging.getLogger(__name__)
 
+TASK_CACHE_TTL = 300  # 5 минут
+TASK_LIST_CACHE_TTL = 60
+TASK_GENERATION_TTL = 86400  # 1 день, больше TTL любой страницы
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_CSV_HEADER = [
+    "id", "name", "description", "deadline_start", "deadline_end",
+    "status", "tags", "documents",
+]
+
 
 class TaskService:
     """
@@ -39,6 +66,7 @@ class TaskService:
 
     Status:
         - get_all_statuses: получение всех статусов
+        - reset_statuses_cache: сброс кеша статусов на всех репликах
 
     Tag:
         - create_tag: создание тега пользователя
@@ -46,10 +74,15 @@ class TaskService:
 
     Task:
         - create_task: создание задачи пользователя
-        - get_all_tasks: получение задач пользователя
-        - get_task_by_id: получение задачи по ID
+        - get_all_tasks: получение задач пользователя (через кеш)
+        - search_tasks: полнотекстовый поиск задач
+        - export_tasks: потоковая выгрузка задач в NDJSON/CSV
+        - get_task_by_id: получение задачи по ID (через кеш)
         - update_task: обновление задачи
         - delete_task: удаление задачи
+        - bulk_create_tasks: пакетное создание задач
+        - bulk_update_tasks: пакетное обновление задач
+        - bulk_delete_tasks: пакетное удаление задач
 
     TaskTag:
         - get_task_tags: получение тегов задачи
@@ -59,21 +92,39 @@ class TaskService:
     Document:
         - upload_document: загрузка документа
         - get_task_documents: получение документов задачи
+        - get_document_file: документ и метаданные его файла для отдачи
         - delete_document: удаление документа
     """
 
-    def __init__(self, task_repo: TaskRepository, cache_repo: CacheRepository):
+    def __init__(
+        self,
+        task_repo: TaskRepository,
+        cache_repo: CacheRepository,
+        storage: Storage,
+    ):
         self.task_repo = task_repo
         self.cache_repo = cache_repo
+        self.storage = storage
 
     # ===== Status =====
 
     async def get_all_statuses(self) -> list[StatusResponse]:
+        """
+        Получает все статусы: L1 (память процесса) -> L2 (Redis) -> БД.
+        """
         cache_key = self.cache_repo.key_all_statuses
+        local = reference_cache.get(cache_key)
+        if local is not None:
+            Metrics.incr("cache:statuses_l1:hit")
+            return local
+        Metrics.incr("cache:statuses_l1:miss")
+
         cached = await self.cache_repo.get(cache_key)
         if cached:
             logger.debug("Статусы получены из кеша")
-            return [StatusResponse(**item) for item in json.loads(cached)]
+            result = [StatusResponse(**item) for item in json.loads(cached)]
+            reference_cache.set(cache_key, result)
+            return result
 
         statuses = await self.task_repo.get_all_statuses()
         result = [StatusResponse.model_validate(status) for status in statuses]
@@ -83,8 +134,24 @@ class TaskService:
             3600,
             json.dumps([status.model_dump() for status in result])
         )
+        reference_cache.set(cache_key, result)
         return result
 
+    async def reset_statuses_cache(self) -> None:
+        """
+        Сбрасывает кеш статусов в Redis и в памяти всех реплик API.
+        """
+        cache_key = self.cache_repo.key_all_statuses
+        await self.cache_repo.delete(cache_key)
+        reference_cache.delete(cache_key)
+
+        # Event-🚌
+        await event_bus.publish(
+            CACHE_INVALIDATE_CHANNEL,
+            LocalCache.invalidation_event(reference_cache.name, cache_key)
+        )
+        logger.info("Кеш статусов сброшен")
+
     # ===== Tag =====
 
     async def create_tag(self, data: TagCreate, user_id: int) -> TagResponse:
@@ -111,6 +178,7 @@ class TaskService:
             user_id=user_id,
         )
         created_task = await self.task_repo.create_task(task_dto)
+        await self._invalidate_tasks(user_id)
         logger.info("Задача создана: id=%d, user_id=%d", created_task.id, user_id)
 
         # Event-🚌
@@ -123,18 +191,156 @@ class TaskService:
 
     async def get_all_tasks(
         self, filters: TaskFilterParams, user_id: int
-    ) -> list[TaskResponse]:
+    ) -> tuple[list[TaskResponse], str | None]:
+        """
+        Возвращает страницу задач и курсор следующей страницы.
+
+        Курсор равен None, если страница неполная (дальше задач нет).
+
+        Страницы кешируются по ключу (user_id, поколение, фильтры).
+        Любое изменение задач пользователя увеличивает поколение,
+        поэтому старые страницы больше не читаются и просто истекают.
+        """
+        generation = await self._get_task_generation(user_id)
+        filters_hash = hashlib.sha256(
+            filters.model_dump_json().encode("utf-8")
+        ).hexdigest()
+        cache_key = self.cache_repo.key_task_list(
+            user_id, generation, filters_hash
+        )
+
+        cached = await self.cache_repo.get(cache_key)
+        if cached:
+            Metrics.incr("cache:task_list:hit")
+            page = json.loads(cached)
+            return [
+                TaskResponse.model_validate(task)
+                for task in page["tasks"]
+            ], page["next_cursor"]
+        Metrics.incr("cache:task_list:miss")
+
         tasks = await self.task_repo.get_all_tasks(filters, user_id)
+
+        next_cursor = None
+        if tasks and len(tasks) == filters.limit:
+            next_cursor = encode_task_cursor(tasks[-1], filters)
+
+        result = [TaskResponse.model_validate(task) for task in tasks]
+
+        await self.cache_repo.setex(
+            cache_key,
+            TASK_LIST_CACHE_TTL,
+            json.dumps({
+                "tasks": [task.model_dump(mode="json") for task in result],
+                "next_cursor": next_cursor,
+            })
+        )
+        return result, next_cursor
+
+    async def search_tasks(
+        self, params: TaskSearchParams, user_id: int
+    ) -> tuple[list[TaskResponse], str | None]:
+        """Ищет задачи по тексту, возвращает страницу и курсор следующей."""
+        tasks = await self.task_repo.search_tasks(params, user_id)
+
+        next_cursor = None
+        if tasks and len(tasks) == params.limit:
+            next_cursor = encode_search_cursor(tasks[-1])
+
         return [
             TaskResponse.model_validate(task)
             for task in tasks
-        ]
+        ], next_cursor
+
+    async def export_tasks(
+        self, user_id: int, export_format: str
+    ) -> AsyncIterator[str]:
+        """
+        Потоково выгружает все задачи пользователя в NDJSON или CSV.
+
+        В памяти одновременно держится не больше одной пачки задач.
+        """
+        if export_format == "csv":
+            yield self._to_csv([EXPORT_CSV_HEADER])
+
+        async for chunk in self.task_repo.stream_tasks(
+            user_id, EXPORT_CHUNK_SIZE
+        ):
+            tasks = [TaskResponse.model_validate(task) for task in chunk]
+
+            if export_format == "csv":
+                yield self._to_csv([
+                    [
+                        task.id,
+                        task.name,
+                        task.description or "",
+                        task.deadline_start or "",
+                        task.deadline_end or "",
+                        task.status.name if task.status else "",
+                        ";".join(tag.name for tag in task.tags),
+                        ";".join(doc.name for doc in task.documents),
+                    ]
+                    for task in tasks
+                ])
+            else:
+                yield "".join(task.model_dump_json() + "\n" for task in tasks)
+
+        logger.info(
+            "Задачи выгружены: user_id=%d, format=%s", user_id, export_format,
+        )
+
+    @staticmethod
+    def _to_csv(rows: list[list]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
 
     async def get_task_by_id(
         self, task_id: int, user_id: int
     ) -> TaskResponse:
+        """
+        Получает задачу через кеш.
+
+        Ключ включает поколение задач пользователя, прочитанное до
+        запроса в БД: если параллельное изменение успело увеличить
+        поколение, устаревшая запись попадет под старый ключ, который
+        больше никто не читает.
+        """
+        generation = await self._get_task_generation(user_id)
+        cache_key = self.cache_repo.key_task(task_id, user_id, generation)
+        cached = await self.cache_repo.get(cache_key)
+        if cached:
+            Metrics.incr("cache:task:hit")
+            return TaskResponse.model_validate_json(cached)
+        Metrics.incr("cache:task:miss")
+
         task = await self.task_repo.get_task_by_id(task_id, user_id)
-        return TaskResponse.model_validate(task)
+        result = TaskResponse.model_validate(task)
+
+        await self.cache_repo.setex(
+            cache_key,
+            TASK_CACHE_TTL,
+            result.model_dump_json()
+        )
+        return result
+
+    async def _get_task_generation(self, user_id: int) -> str:
+        """Текущее поколение кеша задач пользователя."""
+        return await self.cache_repo.get(
+            self.cache_repo.key_task_generation(user_id)
+        ) or "0"
+
+    async def _invalidate_tasks(self, user_id: int) -> None:
+        """
+        Инвалидирует кеш после изменения задач пользователя.
+
+        Увеличивает поколение: закешированные задачи и страницы списков
+        становятся неактуальны и просто истекают по TTL.
+        """
+        await self.cache_repo.incr(
+            self.cache_repo.key_task_generation(user_id),
+            TASK_GENERATION_TTL
+        )
 
     async def update_task(
         self, task_id: int, data: TaskUpdate, user_id: int
@@ -145,6 +351,7 @@ class TaskService:
         updated_task = await self.task_repo.update_task(
             task_id, task_dto, user_id
         )
+        await self._invalidate_tasks(user_id)
 
         # Event-🚌
         updated_fields = data.model_dump(exclude_unset=True, mode="json")
@@ -175,7 +382,9 @@ class TaskService:
     async def delete_task(
         self, task_id: int, user_id: int
     ) -> None:
-        await self.task_repo.delete_task(task_id, user_id)
+        files = await self.task_repo.delete_task(task_id, user_id)
+        await self._invalidate_tasks(user_id)
+        await self._schedule_file_cleanup(files)
         logger.info("Задача удалена: id=%d, user_id=%d", task_id, user_id)
 
         # Event-🚌
@@ -184,6 +393,175 @@ class TaskService:
             {"task_id": task_id, "user_id": user_id}
         )
 
+    async def bulk_create_tasks(
+        self, data: TaskBulkCreate, user_id: int
+    ) -> list[TaskBulkResult]:
+        """
+        Создает задачи пакетом в одной транзакции.
+
+        Задачи с несуществующим статусом не создаются и возвращаются
+        в результате с success=False; порядок результатов совпадает
+        с порядком задач в запросе.
+        """
+        task_dtos = [
+            TaskCreateDTO(
+                name=task.name,
+                description=task.description,
+                deadline_start=task.deadline_start,
+                deadline_end=task.deadline_end,
+                status_id=task.status_id,
+                user_id=user_id,
+            )
+            for task in data.tasks
+        ]
+        tasks = await self.task_repo.bulk_create_tasks(task_dtos)
+        created_tasks = [task for task in tasks if task is not None]
+        await self._invalidate_tasks(user_id)
+        logger.info(
+            "Задачи созданы пакетом: count=%d, user_id=%d",
+            len(created_tasks), user_id,
+        )
+
+        # Event-🚌
+        await event_bus.publish_many([
+            ("task:task_created", {"task_id": task.id, "user_id": user_id})
+            for task in created_tasks
+        ])
+
+        results = []
+        for item, task in zip(data.tasks, tasks):
+            if task is None:
+                results.append(TaskBulkResult(
+                    success=False,
+                    detail=ResourceByIdNotFoundException(
+                        "Статус", item.status_id
+                    ).message
+                ))
+                continue
+
+            results.append(TaskBulkResult(
+                id=task.id,
+                success=True,
+                task=TaskResponse.model_validate(task)
+            ))
+
+        return results
+
+    async def bulk_update_tasks(
+        self, data: TaskBulkUpdate, user_id: int
+    ) -> list[TaskBulkResult]:
+        """
+        Обновляет задачи пакетом в одной транзакции.
+
+        Чужие и несуществующие задачи, а также задачи с несуществующим
+        статусом не обновляются и возвращаются в результате
+        с success=False.
+        """
+        task_dtos = [
+            TaskBulkUpdateDTO(**task.model_dump(exclude_unset=True))
+            for task in data.tasks
+        ]
+        updated_tasks, missing_status_ids = (
+            await self.task_repo.bulk_update_tasks(task_dtos, user_id)
+        )
+        updated_by_id = {task.id: task for task in updated_tasks}
+        await self._invalidate_tasks(user_id)
+        logger.info(
+            "Задачи обновлены пакетом: count=%d, user_id=%d",
+            len(updated_tasks), user_id,
+        )
+
+        results = []
+        events = []
+        for item in data.tasks:
+            if item.status_id in missing_status_ids:
+                results.append(TaskBulkResult(
+                    id=item.id,
+                    success=False,
+                    detail=ResourceByIdNotFoundException(
+                        "Статус", item.status_id
+                    ).message
+                ))
+                continue
+
+            updated_task = updated_by_id.get(item.id)
+            if updated_task is None:
+                results.append(TaskBulkResult(
+                    id=item.id,
+                    success=False,
+                    detail=ResourceByIdNotFoundException(
+                        "Задача", item.id
+                    ).message
+                ))
+                continue
+
+            results.append(TaskBulkResult(
+                id=item.id,
+                success=True,
+                task=TaskResponse.model_validate(updated_task)
+            ))
+
+            updated_fields = item.model_dump(
+                exclude_unset=True, exclude={"id"}, mode="json"
+            )
+            events.append((
+                "task:task_updated",
+                {
+                    "task_id": item.id,
+                    "user_id": user_id,
+                    "updated_fields": updated_fields
+                }
+            ))
+            if "status_id" in updated_fields:
+                events.append((
+                    "task:task_statuses_updated",
+                    {
+                        "task_id": item.id,
+                        "user_id": user_id,
+                        "status_id": updated_fields["status_id"]
+                    }
+                ))
+
+        # Event-🚌
+        await event_bus.publish_many(events)
+
+        return results
+
+    async def bulk_delete_tasks(
+        self, data: TaskBulkDelete, user_id: int
+    ) -> list[TaskBulkResult]:
+        """Удаляет задачи пакетом в одной транзакции."""
+        task_ids = list(dict.fromkeys(data.ids))
+        deleted, files = await self.task_repo.bulk_delete_tasks(
+            task_ids, user_id
+        )
+        deleted_ids = set(deleted)
+        await self._invalidate_tasks(user_id)
+        await self._schedule_file_cleanup(files)
+        logger.info(
+            "Задачи удалены пакетом: count=%d, user_id=%d",
+            len(deleted_ids), user_id,
+        )
+
+        # Event-🚌
+        await event_bus.publish_many([
+            ("task:task_deleted", {"task_id": task_id, "user_id": user_id})
+            for task_id in task_ids if task_id in deleted_ids
+        ])
+
+        return [
+            TaskBulkResult(id=task_id, success=True)
+            if task_id in deleted_ids
+            else TaskBulkResult(
+                id=task_id,
+                success=False,
+                detail=ResourceByIdNotFoundException(
+                    "Задача", task_id
+                ).message
+            )
+            for task_id in task_ids
+        ]
+
     # ===== TaskTag =====
 
     async def get_task_tags(
@@ -197,6 +575,7 @@ class TaskService:
         self, task_id: int, tag_id: int, user_id: int
     ) -> None:
         await self.task_repo.add_tag_to_task(task_id, tag_id, user_id)
+        await self._invalidate_tasks(user_id)
         logger.info(
             "Тег добавлен к задаче: task_id=%d, tag_id=%d, user_id=%d",
             task_id, tag_id, user_id,
@@ -212,6 +591,7 @@ class TaskService:
         self, task_id: int, tag_id: int, user_id: int
     ) -> None:
         await self.task_repo.remove_tag_from_task(task_id, tag_id, user_id)
+        await self._invalidate_tasks(user_id)
         logger.info(
             "Тег удалён у задачи: task_id=%d, tag_id=%d, user_id=%d",
             task_id, tag_id, user_id,
@@ -228,26 +608,134 @@ class TaskService:
     async def upload_document(
         self, task_id: int, file: UploadFile, user_id: int
     ) -> DocumentResponse:
-        """Сохраняет файл на диск и создает запись в БД."""
-        # Сохраняем файл на диск
-        file_path = Path(f"uploads/{task_id}/{uuid.uuid4()}_{file.filename}")
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Сохраняет файл в хранилище блобов и создает запись в БД.
 
-        content = await file.read()
-        file_path.write_bytes(content)
+        Файл хранится один раз на digest: если такой блоб уже есть,
+        новая запись document ссылается на него, а загруженная копия
+        удаляется.
+        """
+        temp_key, digest, size = await self._save_upload(file)
+        blob_key = self._blob_key(digest)
 
-        # Создаем запись в БД
+        # Создаем запись в БД; без нее файл не нужен.
         doc_dto = DocumentCreateDTO(
             name=file.filename,
-            path=str(file_path),
+            path=blob_key,
             task_id=task_id,
+            digest=digest,
+            size=size,
         )
-        created_doc = await self.task_repo.create_document(doc_dto, user_id)
+        try:
+            created_doc = await self.task_repo.create_document(
+                doc_dto, user_id
+            )
+        except Exception:
+            await self.storage.delete(temp_key)
+            raise
+
+        # Блоб кладем после коммита: _release_blob перепроверяет ссылки
+        # и не удалит блоб, на который уже есть запись.
+        try:
+            promoted = await self.storage.promote(temp_key, blob_key)
+        except Exception:
+            await self._rollback_upload(
+                created_doc.id, user_id, temp_key, blob_key, digest
+            )
+            raise
+        if promoted:
+            Metrics.incr("documents:dedup:miss")
+        else:
+            Metrics.incr("documents:dedup:hit")
+        await self._invalidate_tasks(user_id)
         logger.info(
-            "Документ загружен: task_id=%d, file=%s", task_id, file.filename,
+            "Документ загружен: task_id=%d, file=%s, digest=%s",
+            task_id, file.filename, digest,
         )
         return DocumentResponse.model_validate(created_doc)
 
+    async def _rollback_upload(
+        self,
+        document_id: int,
+        user_id: int,
+        temp_key: str,
+        blob_key: str,
+        digest: str,
+    ) -> None:
+        """
+        Откатывает загрузку, если блоб не удалось перенести: удаляет
+        запись документа (иначе она ссылается на несуществующий файл)
+        и временный объект. Блоб без других ссылок ставится в очередь
+        на удаление: перенос мог успеть частично.
+        """
+        try:
+            doc = await self.task_repo.delete_document(document_id, user_id)
+            await self.storage.delete(temp_key)
+        except Exception as e:
+            logger.warning(
+                "Не удалось откатить загрузку документа id=%d: %s",
+                document_id, e,
+            )
+            return
+
+        if doc.remaining_refs == 0:
+            await self._schedule_file_cleanup(
+                [DocumentFileDTO(path=blob_key, digest=digest)]
+            )
+
+    @staticmethod
+    async def _schedule_file_cleanup(files: list[DocumentFileDTO]) -> None:
+        """
+        Ставит удаление файлов в очередь Celery: файлы удаляются пакетами
+        вне event loop. Если брокер недоступен, файлы позже найдет
+        сверка хранилища (reconcile_document_storage).
+
+        delay() публикует в брокер синхронно (и при недоступном брокере
+        ждет повторных попыток), поэтому вызывается в отдельном потоке.
+        """
+        if not files:
+            return
+        try:
+            await asyncio.to_thread(
+                delete_document_files.delay,
+                [file.model_dump() for file in files],
+            )
+        except Exception as e:
+            logger.warning(
+                "Не удалось поставить удаление файлов в очередь: %s", e
+            )
+
+    @staticmethod
+    def _blob_key(digest: str) -> str:
+        """Ключ блоба: blobs/{первые 2 символа}/{digest}."""
+        return f"{BLOB_PREFIX}/{digest[:2]}/{digest}"
+
+    async def _save_upload(self, file: UploadFile) -> tuple[str, str, int]:
+        """
+        Потоково передает файл чанками во временный объект хранилища,
+        по ходу считая SHA-256.
+
+        Файл не читается в память целиком. Размер запроса ограничивает
+        UploadSizeLimitRoute еще до разбора multipart; здесь UPLOAD_MAX_SIZE
+        проверяется повторно по самому файлу: при превышении хранилище
+        удаляет временный объект. Возвращает (временный ключ, digest,
+        размер).
+        """
+        hasher = hashlib.sha256()
+        size = 0
+
+        async def chunks() -> AsyncIterator[bytes]:
+            nonlocal size
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_SIZE:
+                    raise FileTooLargeException(settings.UPLOAD_MAX_SIZE)
+                hasher.update(chunk)
+                yield chunk
+
+        temp_key = await self.storage.upload_temp(chunks())
+        return temp_key, hasher.hexdigest(), size
+
     async def get_task_documents(
         self, task_id: int, user_id: int
     ) -> list[DocumentResponse]:
@@ -261,15 +749,47 @@ class TaskService:
             for doc in documents
         ]
 
+    async def get_document_file(
+        self, document_id: int, user_id: int
+    ) -> tuple[DocumentResponse, StoredObject]:
+        """
+        Получает документ пользователя и место, откуда отдать его файл:
+        локальный путь со stat (для Content-Length, Last-Modified и ETag)
+        или presigned URL внешнего хранилища.
+        """
+        doc = await self.task_repo.get_document(document_id, user_id)
+        try:
+            if doc.digest is None:
+                # Документы, загруженные до хранилища блобов.
+                stored = StoredObject(
+                    path=Path(doc.path),
+                    stat=await aiofiles.os.stat(doc.path),
+                )
+            else:
+                stored = await self.storage.locate(doc.path, doc.name)
+        except FileNotFoundError:
+            logger.warning(
+                "Файл документа отсутствует: id=%d, path=%s",
+                document_id, doc.path,
+            )
+            raise ResourceByIdNotFoundException("Документ", document_id)
+
+        return DocumentResponse.model_validate(doc), stored
+
     async def delete_document(
         self, document_id: int, user_id: int
     ) -> None:
-        """Удаляет документ из БД и с диска."""
+        """
+        Удаляет документ из БД, а блоб — только вместе с последней
+        ссылкой на него (в фоне, через очередь documents.gc).
+        """
         doc = await self.task_repo.delete_document(
             document_id, user_id
         )
+        await self._invalidate_tasks(user_id)
 
-        file_path = Path(doc.path)
-        if file_path.exists():
-            os.remove(file_path)
+        if doc.digest is None or doc.remaining_refs == 0:
+            await self._schedule_file_cleanup(
+                [DocumentFileDTO(path=doc.path, digest=doc.digest)]
+            )
         logger.info("Документ удалён: id=%d, user_id=%d", document_id, user_id)
@@ -1,10 +1,15 @@
 import logging
 
+from src.broker.event_bus_publisher import event_bus
 from src.celery_app.celery_tasks import send_welcome_email
 from src.core.encryption import Encryption
-from src.core.password import get_password_hash
-from src.model.api_schemas import SignUpRequest
+from src.core.password import get_password_hash_async, password_needs_rehash
+from src.model.api_schemas import PasswordHashReportItem, SignUpRequest
 from src.model.users import UserBase
+from src.repository.cache import CacheRepository
+from src.repository.local_cache import (
+    CACHE_INVALIDATE_CHANNEL, LocalCache, user_cache
+)
 from src.repository.users.users import UserRepository
 
 logger = logging.getLogger(__name__)
@@ -22,10 +27,18 @@ class UserService:
         - get_user_by_login: получение пользователя по логину
         - register: регистрация нового пользователя
         - update_password: обновление пароля пользователя
+        - update_role: изменение роли пользователя
+        - get_password_hash_report: распределение параметров хешей паролей
+
+    При смене пароля или роли закешированный пользователь удаляется
+    из Redis и из памяти всех реплик API (через event bus).
     """
 
-    def __init__(self, user_repo: UserRepository):
+    def __init__(
+        self, user_repo: UserRepository, cache_repo: CacheRepository
+    ):
         self.user_repo = user_repo
+        self.cache_repo = cache_repo
 
     async def get_user_by_id(self, user_id: int) -> UserBase:
         """Получает пользователя по ID."""
@@ -44,7 +57,7 @@ class UserService:
         from src.repository.users.dto import UserCreateDTO
         dto = UserCreateDTO(
             username=data.username,
-            password=get_password_hash(data.password),
+            password=await get_password_hash_async(data.password),
             email=await Encryption.encrypt_value(data.email),
             phone=await Encryption.encrypt_value(data.phone),
         )
@@ -60,7 +73,44 @@ class UserService:
         self, user_id: int, new_password: str
     ) -> None:
         """Хеширует новый пароль и обновляет его в БД."""
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await get_password_hash_async(new_password)
         await self.user_repo.update_user_password_by_user_id(
             user_id, hashed_password
         )
+        await self._invalidate_user(user_id)
+
+    async def update_role(self, user_id: int, role: str) -> UserBase:
+        """Меняет роль пользователя."""
+        user_dto = await self.user_repo.update_user_role_by_user_id(
+            user_id, role
+        )
+        await self._invalidate_user(user_id)
+        logger.info("Роль изменена: user_id=%d, role=%s", user_id, role)
+        return UserBase.model_validate(user_dto)
+
+    async def get_password_hash_report(self) -> list[PasswordHashReportItem]:
+        """
+        Сколько пользователей на каждом наборе параметров Argon2
+        и какие наборы устарели (будут пересчитаны при входе).
+        """
+        groups = await self.user_repo.count_users_by_hash_params()
+        return [
+            PasswordHashReportItem(
+                params=group.params,
+                users=group.users,
+                outdated=password_needs_rehash(group.sample_hash),
+            )
+            for group in groups
+        ]
+
+    async def _invalidate_user(self, user_id: int) -> None:
+        """Удаляет пользователя из кеша Redis и in-process кешей реплик."""
+        cache_key = self.cache_repo.key_user(user_id)
+        await self.cache_repo.delete(cache_key)
+        user_cache.delete(cache_key)
+
+        # Event-🚌
+        await event_bus.publish(
+            CACHE_INVALIDATE_CHANNEL,
+            LocalCache.invalidation_event(user_cache.name, cache_key)
+        )
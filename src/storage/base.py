@@ -0,0 +1,88 @@
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+# Префиксы ключей: блобы по SHA-256 содержимого и незавершенные загрузки.
+BLOB_PREFIX = "blobs"
+TEMP_PREFIX = "tmp"
+
+
+@dataclass(frozen=True)
+class StorageEntry:
+    """Объект хранилища при обходе: ключ, размер и время изменения."""
+    key: str
+    size: int
+    modified: float
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """
+    Где клиенту взять файл: локальный путь со stat (отдается через
+    FileResponse) или ссылка на внешнее хранилище (редирект).
+    """
+    path: Path | None = None
+    stat: os.stat_result | None = None
+    url: str | None = None
+
+
+class Storage(ABC):
+    """
+    Хранилище файлов документов.
+
+    Файлы адресуются ключами вида "blobs/ab/abcd...". Загрузка идет
+    в два шага: upload_temp потоково пишет во временный объект,
+    promote переносит его под постоянный ключ, когда тот известен
+    (ключ зависит от хеша содержимого).
+    """
+
+    async def connect(self) -> None:
+        """Открывает соединения, если они нужны бэкенду."""
+
+    async def close(self) -> None:
+        """Закрывает соединения бэкенда."""
+
+    @abstractmethod
+    async def upload_temp(self, chunks: AsyncIterator[bytes]) -> str:
+        """
+        Потоково пишет чанки во временный объект, возвращает его ключ.
+
+        При ошибке (в том числе из итератора чанков) временный объект
+        удаляется, исключение пробрасывается.
+        """
+
+    @abstractmethod
+    async def promote(self, temp_key: str, key: str) -> bool:
+        """
+        Переносит временный объект под постоянный ключ.
+
+        Если объект с таким ключом уже есть, временный удаляется
+        и возвращается False.
+        """
+
+    @abstractmethod
+    async def move(self, src_key: str, dst_key: str) -> None:
+        """Переименовывает объект. FileNotFoundError, если src нет."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Проверяет наличие объекта."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Удаляет объект; отсутствие объекта не ошибка."""
+
+    @abstractmethod
+    def list_objects(self, prefix: str) -> AsyncIterator[StorageEntry]:
+        """Перебирает объекты с ключами, начинающимися с prefix."""
+
+    @abstractmethod
+    async def locate(self, key: str, filename: str) -> StoredObject:
+        """
+        Готовит объект к отдаче клиенту под именем filename.
+
+        FileNotFoundError, если бэкенд может дешево проверить,
+        что объекта нет.
+        """
@@ -0,0 +1,40 @@
+from src.core.config import settings
+from src.storage.base import Storage
+from src.storage.local import LocalStorage
+from src.storage.s3 import S3Storage
+
+
+class StorageClient:
+    """Клиент файлового хранилища документов (локальный диск или S3)."""
+    def __init__(self) -> None:
+        self.storage: Storage | None = None
+
+    async def connect(self) -> None:
+        if settings.STORAGE_BACKEND == "s3":
+            storage: Storage = S3Storage(
+                bucket=settings.S3_BUCKET_NAME,
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+                region=settings.S3_REGION,
+                access_key_id=settings.S3_ACCESS_KEY_ID,
+                secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                part_size=settings.S3_MULTIPART_PART_SIZE,
+                presigned_url_ttl=settings.S3_PRESIGNED_URL_TTL,
+            )
+        else:
+            storage = LocalStorage(settings.UPLOAD_DIR)
+
+        await storage.connect()
+        self.storage = storage
+
+    async def close(self) -> None:
+        if self.storage:
+            await self.storage.close()
+
+    def get_storage(self) -> Storage:
+        if self.storage is None:
+            raise RuntimeError("Хранилище файлов еще не запустилось.")
+        return self.storage
+
+
+storage_client = StorageClient()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+from src.storage.base import (
+    TEMP_PREFIX, Storage, StorageEntry, StoredObject
+)
+
+
+class LocalStorage(Storage):
+    """
+    Хранилище на локальном диске: ключ — путь относительно root.
+
+    Запись и переименования выполняются через aiofiles и не блокируют
+    event loop. Подходит для одного узла API (или общего тома).
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    async def upload_temp(self, chunks: AsyncIterator[bytes]) -> str:
+        temp_key = f"{TEMP_PREFIX}/{uuid.uuid4()}.part"
+        temp_path = self.path(temp_key)
+        await aiofiles.os.makedirs(temp_path.parent, exist_ok=True)
+
+        try:
+            async with aiofiles.open(temp_path, "wb") as out:
+                async for chunk in chunks:
+                    await out.write(chunk)
+        except BaseException:
+            await self.delete(temp_key)
+            raise
+
+        return temp_key
+
+    async def promote(self, temp_key: str, key: str) -> bool:
+        if await self.exists(key):
+            await self.delete(temp_key)
+            return False
+
+        await self.move(temp_key, key)
+        return True
+
+    async def move(self, src_key: str, dst_key: str) -> None:
+        dst_path = self.path(dst_key)
+        await aiofiles.os.makedirs(dst_path.parent, exist_ok=True)
+        await aiofiles.os.replace(self.path(src_key), dst_path)
+
+    async def exists(self, key: str) -> bool:
+        return await aiofiles.os.path.exists(self.path(key))
+
+    async def delete(self, key: str) -> None:
+        try:
+            await aiofiles.os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    async def list_objects(self, prefix: str) -> AsyncIterator[StorageEntry]:
+        # Обход каталога блокирующий — выполняем его в потоке.
+        entries = await asyncio.to_thread(self._scan, self.path(prefix))
+        for entry in entries:
+            yield entry
+
+    def _scan(self, directory: Path) -> list[StorageEntry]:
+        entries = []
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = Path(dirpath, filename)
+                try:
+                    stat_result = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append(StorageEntry(
+                    key=path.relative_to(self.root).as_posix(),
+                    size=stat_result.st_size,
+                    modified=stat_result.st_mtime,
+                ))
+        return entries
+
+    async def locate(self, key: str, filename: str) -> StoredObject:
+        path = self.path(key)
+        return StoredObject(path=path, stat=await aiofiles.os.stat(path))
@@ -0,0 +1,213 @@
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from urllib.parse import quote
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+
+from src.storage.base import (
+    TEMP_PREFIX, Storage, StorageEntry, StoredObject
+)
+
+# Минимальный размер части multipart-загрузки в S3 (кроме последней).
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+NOT_FOUND_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def _is_not_found(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in NOT_FOUND_CODES
+
+
+class S3Storage(Storage):
+    """
+    S3-совместимое хранилище (AWS S3, MinIO и т.п.).
+
+    Загрузка идет multipart-частями по part_size: в памяти держится
+    не больше одной части. Отдача — по presigned URL, байты скачиваемого
+    файла не проходят через процесс API.
+
+    Presigned URL подписываются для public_endpoint_url (адрес
+    эндпоинта, доступный клиентам), если он отличается от внутреннего
+    endpoint_url. Это именно эндпоинт, а не URL бакета: имя бакета
+    botocore добавляет в ссылку сам.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None,
+        public_endpoint_url: str | None,
+        region: str,
+        access_key_id: str,
+        secret_access_key: str,
+        part_size: int,
+        presigned_url_ttl: int,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url or None
+        self.public_endpoint_url = public_endpoint_url or self.endpoint_url
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        self.presigned_url_ttl = presigned_url_ttl
+
+        self._exit_stack = AsyncExitStack()
+        self._client = None
+        self._presign_client = None
+
+    def _create_client(self, endpoint_url: str | None):
+        # Для собственного endpoint (MinIO) — path-style адреса.
+        config = AioConfig(
+            signature_version="s3v4",
+            s3={"addressing_style": "path" if endpoint_url else "auto"},
+        )
+        return get_session().create_client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=self.region,
+            aws_access_key_id=self.access_key_id,
+            aws_secret_access_key=self.secret_access_key,
+            config=config,
+        )
+
+    async def connect(self) -> None:
+        self._client = await self._exit_stack.enter_async_context(
+            self._create_client(self.endpoint_url)
+        )
+        if self.public_endpoint_url == self.endpoint_url:
+            self._presign_client = self._client
+        else:
+            self._presign_client = await self._exit_stack.enter_async_context(
+                self._create_client(self.public_endpoint_url)
+            )
+
+    async def close(self) -> None:
+        await self._exit_stack.aclose()
+        self._client = None
+        self._presign_client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            raise RuntimeError("S3-хранилище еще не подключено.")
+        return self._client
+
+    async def upload_temp(self, chunks: AsyncIterator[bytes]) -> str:
+        temp_key = f"{TEMP_PREFIX}/{uuid.uuid4()}"
+        upload = await self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=temp_key
+        )
+        upload_id = upload["UploadId"]
+
+        parts: list[dict] = []
+        buffer = bytearray()
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= self.part_size:
+                    parts.append(
+                        await self._upload_part(
+                            temp_key, upload_id, len(parts) + 1, bytes(buffer)
+                        )
+                    )
+                    buffer.clear()
+
+            # Последняя часть может быть меньше минимума (или пустой файл).
+            if buffer or not parts:
+                parts.append(
+                    await self._upload_part(
+                        temp_key, upload_id, len(parts) + 1, bytes(buffer)
+                    )
+                )
+
+            await self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=temp_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=temp_key, UploadId=upload_id
+            )
+            raise
+
+        return temp_key
+
+    async def _upload_part(
+        self, key: str, upload_id: str, part_number: int, body: bytes
+    ) -> dict:
+        response = await self.client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    async def promote(self, temp_key: str, key: str) -> bool:
+        if await self.exists(key):
+            await self.delete(temp_key)
+            return False
+
+        await self.move(temp_key, key)
+        return True
+
+    async def move(self, src_key: str, dst_key: str) -> None:
+        # В S3 нет переименования: копия на стороне сервера + удаление.
+        try:
+            await self.client.copy_object(
+                Bucket=self.bucket,
+                Key=dst_key,
+                CopySource={"Bucket": self.bucket, "Key": src_key},
+            )
+        except ClientError as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(src_key) from None
+            raise
+        await self.delete(src_key)
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if _is_not_found(e):
+                return False
+            raise
+        return True
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    async def list_objects(self, prefix: str) -> AsyncIterator[StorageEntry]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(
+            Bucket=self.bucket, Prefix=f"{prefix}/"
+        ):
+            for item in page.get("Contents", []):
+                yield StorageEntry(
+                    key=item["Key"],
+                    size=item["Size"],
+                    modified=item["LastModified"].timestamp(),
+                )
+
+    async def locate(self, key: str, filename: str) -> StoredObject:
+        if self._presign_client is None:
+            raise RuntimeError("S3-хранилище еще не подключено.")
+
+        url = await self._presign_client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentDisposition": (
+                    f"attachment; filename*=UTF-8''{quote(filename)}"
+                ),
+            },
+            ExpiresIn=self.presigned_url_ttl,
+        )
+        return StoredObject(url=url)
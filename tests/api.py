@@ -0,0 +1,23 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.deps import get_task_service
+from src.api.v1.tasks import router as tasks_router
+from src.core.security import Security
+from src.exception.handlers import register_exception_handlers
+from src.model.users import UserBase
+
+TEST_USER = UserBase(id=1, username="tester", role="user")
+
+
+def tasks_client(service) -> TestClient:
+    """
+    Клиент к роутеру задач с подмененным сервисом и текущим
+    пользователем TEST_USER.
+    """
+    app = FastAPI()
+    app.include_router(tasks_router, prefix="/api/v1")
+    register_exception_handlers(app)
+    app.dependency_overrides[get_task_service] = lambda: service
+    app.dependency_overrides[Security.get_current_user] = lambda: TEST_USER
+    return TestClient(app)
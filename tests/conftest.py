@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+# Тесты репозиториев идут на настоящем PostgreSQL, мигрированном до head
+# (alembic upgrade head): TEST_DATABASE_URL=postgresql+asyncpg://...
+# Без него они пропускаются.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+
+@pytest.fixture
+def database_url() -> str:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    return TEST_DATABASE_URL
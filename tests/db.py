@@ -0,0 +1,67 @@
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+
+@asynccontextmanager
+async def user_session(
+    database_url: str,
+) -> AsyncIterator[tuple[AsyncSession, int]]:
+    """
+    Сессия БД и новый пользователь.
+
+    После теста пользователь удаляется, его задачи и теги — каскадно.
+    """
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            async with session.begin():
+                result = await session.execute(
+                    text("""
+                        INSERT INTO "user" (username, password, email, role)
+                        VALUES (:username, 'x', 'test@example.com', 'user')
+                        RETURNING id
+                    """),
+                    {"username": f"test-{uuid.uuid4().hex}"},
+                )
+                user_id = result.scalar_one()
+            try:
+                yield session, user_id
+            finally:
+                await session.rollback()
+                async with session.begin():
+                    await session.execute(
+                        text('DELETE FROM "user" WHERE id = :id'),
+                        {"id": user_id},
+                    )
+    finally:
+        await engine.dispose()
+
+
+async def status_ids(session: AsyncSession) -> list[int]:
+    """ID справочных статусов."""
+    async with session.begin():
+        result = await session.execute(
+            text("SELECT id FROM status ORDER BY id")
+        )
+        return [row.id for row in result.fetchall()]
+
+
+@contextmanager
+def count_queries(session: AsyncSession) -> Iterator[list[str]]:
+    """Собирает SQL-запросы, выполненные через сессию внутри блока."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
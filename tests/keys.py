@@ -0,0 +1,37 @@
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.core.keys import Keys
+
+
+def generate_key(algorithm: str):
+    """Новый приватный ключ для алгоритма JWT."""
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def write_pem(tmp_path, name: str, private_key) -> tuple[str, str]:
+    """Сохраняет пару ключей в PEM, возвращает (приватный, публичный) пути."""
+    private_path = tmp_path / f"{name}.pem"
+    public_path = tmp_path / f"{name}.pub.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+    return str(private_path), str(public_path)
+
+
+def reset_keys(monkeypatch) -> None:
+    """Сбрасывает загруженные ключи Keys на время теста."""
+    monkeypatch.setattr(Keys, "_private_key", None)
+    monkeypatch.setattr(Keys, "_private_kid", None)
+    monkeypatch.setattr(Keys, "_algorithm", None)
+    monkeypatch.setattr(Keys, "_public_keys", {})
@@ -0,0 +1,120 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from src.api.deps import get_cache_repository
+from src.db.redis import redis_client
+from src.repository.cache import CacheRepository
+
+USER_ID = 1
+TTL = 3600
+
+
+async def _rotate_concurrently():
+    cache = CacheRepository(FakeAsyncRedis())
+    await cache.add_session(USER_ID, "old", TTL, "old-token")
+
+    results = await asyncio.gather(
+        cache.rotate_session(USER_ID, "old", "new-1", TTL, "token-1"),
+        cache.rotate_session(USER_ID, "old", "new-2", TTL, "token-2"),
+    )
+    assert sorted(results) == [False, True]
+
+    winner = "new-1" if results[0] else "new-2"
+    sessions = await cache.redis.smembers(cache.key_sessions(USER_ID))
+    assert sessions == {winner.encode()}
+    assert await cache.get(cache.key_token(USER_ID, "old")) is None
+
+
+def test_rotate_session_concurrent_refresh_succeeds_once():
+    asyncio.run(_rotate_concurrently())
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sliding_window_blocks_over_limit_until_oldest_expires(monkeypatch):
+    clock = Clock(1_000_000.0)
+    monkeypatch.setattr("src.repository.cache.time.time", clock)
+
+    async def scenario():
+        cache = CacheRepository(FakeAsyncRedis())
+        limits = {"ratelimit:user": 2, "ratelimit:ip": 3}
+
+        assert await cache.hit_rate_limit(limits, window=60) == 0
+        clock.now += 10
+        assert await cache.hit_rate_limit(limits, window=60) == 0
+        clock.now += 10
+
+        # Лимит по пользователю исчерпан: ждать, пока выйдет первая попытка.
+        assert await cache.hit_rate_limit(limits, window=60) == 40
+        # Отклоненная попытка не засчитывается ни в одно окно.
+        assert await cache.redis.zcard("ratelimit:ip") == 2
+
+        clock.now += 41
+        assert await cache.hit_rate_limit(limits, window=60) == 0
+
+    asyncio.run(scenario())
+
+
+def test_sliding_window_limits_are_independent(monkeypatch):
+    clock = Clock(1_000_000.0)
+    monkeypatch.setattr("src.repository.cache.time.time", clock)
+
+    async def scenario():
+        cache = CacheRepository(FakeAsyncRedis())
+
+        for _ in range(2):
+            assert await cache.hit_rate_limit({"ratelimit:a": 2}, 60) == 0
+        assert await cache.hit_rate_limit({"ratelimit:a": 2}, 60) == 60
+        assert await cache.hit_rate_limit({"ratelimit:b": 2}, 60) == 0
+
+    asyncio.run(scenario())
+
+
+def test_scripts_survive_script_cache_flush():
+    async def scenario():
+        cache = CacheRepository(FakeAsyncRedis())
+        await cache.add_session(USER_ID, "old", TTL, "old-token")
+        await cache.redis.script_flush()
+
+        assert await cache.rotate_session(
+            USER_ID, "old", "new", TTL, "new-token"
+        )
+        assert await cache.hit_rate_limit({"ratelimit:a": 1}, 60) == 0
+
+    asyncio.run(scenario())
+
+
+def test_cache_repository_is_shared_per_redis_client(monkeypatch):
+    monkeypatch.setattr(redis_client, "redis", FakeAsyncRedis())
+    repo = get_cache_repository()
+
+    assert get_cache_repository() is repo
+
+    monkeypatch.setattr(redis_client, "redis", FakeAsyncRedis())
+    assert get_cache_repository() is not repo
+
+
+def test_revoke_sessions_deletes_only_indexed_tokens_of_user():
+    async def scenario():
+        cache = CacheRepository(FakeAsyncRedis(decode_responses=True))
+        await cache.add_session(USER_ID, "a", TTL, "token-a")
+        await cache.add_session(USER_ID, "b", TTL, "token-b")
+        await cache.add_session(USER_ID + 1, "c", TTL, "token-c")
+
+        assert await cache.revoke_sessions(USER_ID) == 2
+        assert await cache.get(cache.key_token(USER_ID, "a")) is None
+        assert await cache.get(cache.key_token(USER_ID, "b")) is None
+        assert await cache.redis.exists(cache.key_sessions(USER_ID)) == 0
+        assert await cache.get_sessions(USER_ID) == {}
+
+        assert await cache.get(cache.key_token(USER_ID + 1, "c")) == "token-c"
+        assert await cache.revoke_sessions(USER_ID) == 0
+
+    asyncio.run(scenario())
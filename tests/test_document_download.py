@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from src.api.v1.tasks import _etag_matches
+from src.repository.tasks.dto import DocumentDTO
+from src.storage.base import StoredObject
+from tests.api import tasks_client
+
+URL = "/api/v1/tasks/document/1/content"
+CONTENT = b"0123456789"
+
+
+class DownloadService:
+    def __init__(self, stored: StoredObject):
+        self.stored = stored
+
+    async def get_document_file(self, document_id, user_id):
+        doc = DocumentDTO(id=document_id, name="a.txt", path="blobs/x")
+        return doc, self.stored
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "blob"
+    path.write_bytes(CONTENT)
+    stored = StoredObject(path=path, stat=os.stat(path))
+    return tasks_client(DownloadService(stored))
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+    ('"x", "y"', False),
+])
+def test_etag_matches_weak_comparison(header, expected):
+    assert _etag_matches(header, '"abc"') is expected
+
+
+def test_download_returns_file_with_etag(client):
+    response = client.get(URL)
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_download_not_modified_for_matching_etag(client):
+    etag = client.get(URL).headers["etag"]
+
+    response = client.get(URL, headers={"If-None-Match": f'"x", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_download_range_returns_partial_content(client):
+    response = client.get(URL, headers={"Range": "bytes=2-5"})
+
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == f"bytes 2-5/{len(CONTENT)}"
+
+
+def test_download_redirects_to_external_storage():
+    stored = StoredObject(url="https://storage.example/blob")
+
+    response = tasks_client(DownloadService(stored)).get(
+        URL, follow_redirects=False
+    )
+
+    assert response.status_code == 307
+    assert response.headers["location"] == stored.url
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import time
+import uuid
+
+from src.celery_app.document_gc import _reconcile
+from src.core.config import settings
+from src.repository.tasks.dto import DocumentCreateDTO, TaskCreateDTO
+from src.repository.tasks.tasks import TaskRepository
+from tests.db import user_session
+
+
+def _write(root, key: str) -> str:
+    path = os.path.join(root, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"data")
+    # Старше STORAGE_ORPHAN_GRACE_PERIOD.
+    old = time.time() - settings.STORAGE_ORPHAN_GRACE_PERIOD - 60
+    os.utime(path, (old, old))
+    return path
+
+
+def test_reconcile_deletes_only_unreferenced_legacy_files(
+    database_url, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setenv("DATABASE_URL", database_url)
+
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            repo = TaskRepository(session)
+            [task] = await repo.bulk_create_tasks([
+                TaskCreateDTO(name="task", user_id=user_id)
+            ])
+            referenced = f"{task.id}/{uuid.uuid4()}_a.txt"
+            orphan = f"{task.id}/{uuid.uuid4()}_b.txt"
+            kept = [
+                _write(tmp_path, referenced),
+                _write(tmp_path, ".gitkeep"),
+                _write(tmp_path, "notes/readme.txt"),
+                _write(tmp_path, f"{task.id}/not-a-uuid_c.txt"),
+            ]
+            orphan_path = _write(tmp_path, orphan)
+            # Путь в document записан так, как его собрал API.
+            await repo.create_document(
+                DocumentCreateDTO(
+                    name="a.txt",
+                    path=os.path.join(str(tmp_path), ".", referenced),
+                    task_id=task.id,
+                ),
+                user_id,
+            )
+
+            dry_run = await _reconcile(dry_run=True)
+            assert dry_run["legacy_files"] == 1
+            assert os.path.exists(orphan_path)
+
+            report = await _reconcile(dry_run=False)
+
+            assert report["legacy_files"] == 1
+            assert not os.path.exists(orphan_path)
+            assert all(os.path.exists(path) for path in kept)
+
+    asyncio.run(scenario())
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from fastapi import HTTPException
+
+from src.core.keys import Keys
+from src.core.security import Security
+from tests.keys import generate_key, reset_keys, write_pem
+
+PAYLOAD = {"sub": "1", "exp": 4102444800, "scopes": ["user"]}
+
+
+def _initialize(tmp_path, algorithm: str, extra_public_key_paths=None):
+    private_key = generate_key(algorithm)
+    private_path, public_path = write_pem(tmp_path, algorithm, private_key)
+    asyncio.run(Keys.initialize(
+        private_path, public_path, "",
+        extra_public_key_paths=extra_public_key_paths,
+        algorithm=algorithm,
+    ))
+    return private_key
+
+
+def _decode(token: str) -> int:
+    user_id, _, _, _ = asyncio.run(Security._decode_token(token))
+    return user_id
+
+
+@pytest.fixture(autouse=True)
+def keys(monkeypatch):
+    reset_keys(monkeypatch)
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_token_signed_and_verified_with_configured_algorithm(
+    tmp_path, algorithm
+):
+    _initialize(tmp_path, algorithm)
+
+    token = asyncio.run(Security._create_token(1, "access", 1, ["user"]))
+
+    header = jwt.get_unverified_header(token)
+    assert header["alg"] == algorithm
+    assert header["kid"] == Keys.get_private_kid()
+    assert _decode(token) == 1
+
+
+def test_algorithm_must_match_private_key(tmp_path):
+    private_path, public_path = write_pem(
+        tmp_path, "rsa", generate_key("RS256")
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(Keys.initialize(
+            private_path, public_path, "", algorithm="ES256"
+        ))
+
+
+def test_kidless_token_verified_by_old_key_after_algorithm_change(tmp_path):
+    old_key = generate_key("RS256")
+    _, old_public_path = write_pem(tmp_path, "old", old_key)
+    _initialize(tmp_path, "EdDSA", extra_public_key_paths=[old_public_path])
+
+    token = jwt.encode(PAYLOAD, old_key, algorithm="RS256")
+
+    assert _decode(token) == 1
+
+
+def test_kidless_token_with_foreign_algorithm_rejected(tmp_path):
+    private_key = _initialize(tmp_path, "RS256")
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    # Подмена алгоритма: публичный ключ как HMAC-секрет.
+    signing_input = b".".join(
+        jwt.utils.base64url_encode(json.dumps(part).encode())
+        for part in ({"alg": "HS256", "typ": "JWT"}, PAYLOAD)
+    )
+    signature = hmac.new(public_pem, signing_input, hashlib.sha256).digest()
+    forged = (
+        signing_input + b"." + jwt.utils.base64url_encode(signature)
+    ).decode()
+    unsigned = jwt.encode(PAYLOAD, None, algorithm="none")
+
+    for token in (forged, unsigned):
+        with pytest.raises(HTTPException) as exc_info:
+            _decode(token)
+        assert exc_info.value.status_code == 401
+
+
+def test_token_with_kid_checked_only_by_that_key(tmp_path):
+    _initialize(tmp_path, "RS256")
+    other_key = generate_key("RS256")
+
+    token = jwt.encode(
+        PAYLOAD, other_key, algorithm="RS256",
+        headers={"kid": Keys.get_private_kid()},
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        _decode(token)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.core.keys import Keys
+from tests.keys import generate_key, reset_keys, write_pem
+
+
+@pytest.fixture
+def rotated_keys(monkeypatch, tmp_path):
+    """Текущий ключ подписи и предыдущий, оставленный для проверки."""
+    reset_keys(monkeypatch)
+    current, previous = generate_key("RS256"), generate_key("RS256")
+    private_path, public_path = write_pem(tmp_path, "current", current)
+    _, previous_path = write_pem(tmp_path, "previous", previous)
+    asyncio.run(Keys.initialize(
+        private_path, public_path, "",
+        extra_public_key_paths=[previous_path],
+    ))
+    return current, previous
+
+
+def test_kid_selects_exactly_one_key(rotated_keys):
+    current, previous = rotated_keys
+    current_kid = Keys.compute_kid(current.public_key())
+    previous_kid = Keys.compute_kid(previous.public_key())
+
+    assert Keys.get_private_kid() == current_kid
+    [(key, algorithm)] = Keys.get_public_keys(previous_kid, "RS256")
+    assert Keys.compute_kid(key) == previous_kid
+    assert algorithm == "RS256"
+    assert Keys.get_public_keys("unknown", "RS256") == []
+
+
+def test_kid_is_stable_and_distinct_per_key(rotated_keys):
+    current, previous = rotated_keys
+
+    assert Keys.compute_kid(current.public_key()) == Keys.compute_kid(
+        current.public_key()
+    )
+    assert Keys.compute_kid(current.public_key()) != Keys.compute_kid(
+        previous.public_key()
+    )
+    assert len(Keys.compute_kid(current.public_key())) == 16
+
+
+def test_jwks_lists_every_public_key(rotated_keys):
+    current, previous = rotated_keys
+
+    jwks = Keys.get_jwks()
+
+    assert {jwk["kid"] for jwk in jwks["keys"]} == {
+        Keys.compute_kid(current.public_key()),
+        Keys.compute_kid(previous.public_key()),
+    }
+    for jwk in jwks["keys"]:
+        assert jwk["kty"] == "RSA"
+        assert jwk["alg"] == "RS256"
+        assert jwk["use"] == "sig"
+        assert "d" not in jwk
+
+
+def test_initialize_parses_keys_once(rotated_keys, tmp_path):
+    private_key = Keys.get_private_key()
+
+    asyncio.run(Keys.initialize(
+        str(tmp_path / "missing.pem"), str(tmp_path / "missing.pub.pem"), ""
+    ))
+
+    assert Keys.get_private_key() is private_key
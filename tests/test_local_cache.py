@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.repository.local_cache import LocalCache
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(1000.0)
+    monkeypatch.setattr("src.repository.local_cache.time.monotonic", clock)
+    monkeypatch.setattr(LocalCache, "_registry", {})
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = LocalCache("test", ttl=10)
+    cache.set("a", 1)
+
+    clock.now += 10
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert "a" not in cache._data
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = LocalCache("test", ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidation_event_deletes_key_in_named_cache(clock):
+    statuses = LocalCache("statuses", ttl=10)
+    users = LocalCache("users", ttl=10)
+    statuses.set("all", [1])
+    users.set("all", [2])
+
+    asyncio.run(LocalCache.handle_invalidation(
+        LocalCache.invalidation_event("statuses", "all")
+    ))
+    asyncio.run(LocalCache.handle_invalidation({"cache": "unknown", "key": "all"}))
+
+    assert statuses.get("all") is None
+    assert users.get("all") == [2]
@@ -0,0 +1,135 @@
+import base64
+import datetime
+import json
+
+import pytest
+
+from src.exception.exceptions import InvalidCursorException
+from src.model.filters import TaskFilterParams
+from src.repository.tasks.dto import (
+    StatusDTO, TaskCursorDTO, TaskResponseDTO, TaskSearchResultDTO
+)
+from src.repository.tasks.pagination import (
+    decode_search_cursor, decode_task_cursor,
+    encode_search_cursor, encode_task_cursor
+)
+from src.repository.tasks.tasks import TaskRepository
+
+TASK = TaskResponseDTO(
+    id=42,
+    name="Отчет",
+    description=None,
+    deadline_start=datetime.date(2026, 1, 1),
+    deadline_end=None,
+    status=StatusDTO(id=3, name="В работе"),
+)
+
+
+def _forge(payload: dict) -> str:
+    raw = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
+
+
+@pytest.mark.parametrize("order_by, value", [
+    ("id", 42),
+    ("name", "Отчет"),
+    ("deadline_start", datetime.date(2026, 1, 1)),
+    ("deadline_end", None),
+    ("status_id", 3),
+])
+def test_task_cursor_round_trip(order_by, value):
+    filters = TaskFilterParams(order_by=order_by, order_direction="asc")
+    cursor = encode_task_cursor(TASK, filters)
+
+    decoded = decode_task_cursor(filters.model_copy(update={"cursor": cursor}))
+
+    assert decoded == TaskCursorDTO(value=value, id=42)
+
+
+def test_task_cursor_rejected_for_other_sort():
+    cursor = encode_task_cursor(TASK, TaskFilterParams(order_by="name"))
+    filters = TaskFilterParams(order_by="id", cursor=cursor)
+
+    with pytest.raises(InvalidCursorException):
+        decode_task_cursor(filters)
+
+
+@pytest.mark.parametrize("cursor", [
+    "не base64",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    _forge(["list"]),
+    _forge({"order_by": "id", "order_direction": "desc"}),
+])
+def test_task_cursor_rejects_garbage(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_task_cursor(TaskFilterParams(cursor=cursor))
+
+
+@pytest.mark.parametrize("order_by, value, cursor_id", [
+    ("status_id", "3", 1),
+    ("status_id", 3.5, 1),
+    ("status_id", True, 1),
+    ("status_id", 2 ** 63, 1),
+    ("name", 5, 1),
+    ("name", None, 1),
+    ("id", None, 1),
+    ("deadline_end", 20260101, 1),
+    ("deadline_end", "31.12.2026", 1),
+    ("id", 1, "1"),
+    ("id", 1, None),
+    ("id", 1, -2 ** 64),
+])
+def test_task_cursor_rejects_forged_value(order_by, value, cursor_id):
+    cursor = _forge({
+        "order_by": order_by,
+        "order_direction": "desc",
+        "value": value,
+        "id": cursor_id,
+    })
+    filters = TaskFilterParams(order_by=order_by, cursor=cursor)
+
+    with pytest.raises(InvalidCursorException) as exc_info:
+        decode_task_cursor(filters)
+    assert exc_info.value.status_code == 400
+
+
+def test_search_cursor_round_trip():
+    task = TaskSearchResultDTO(**TASK.model_dump(), rank=0.25)
+
+    decoded = decode_search_cursor(encode_search_cursor(task))
+
+    assert decoded == TaskCursorDTO(value=0.25, id=42)
+
+
+@pytest.mark.parametrize("value", ["0.5", None, True, float("nan")])
+def test_search_cursor_rejects_forged_value(value):
+    cursor = _forge({
+        "order_by": "rank",
+        "order_direction": "desc",
+        "value": value,
+        "id": 1,
+    })
+
+    with pytest.raises(InvalidCursorException):
+        decode_search_cursor(cursor)
+
+
+@pytest.mark.parametrize("order_by, direction, value, expected", [
+    ("id", "desc", 42, "task.id < :cursor_id"),
+    ("id", "asc", 42, "task.id > :cursor_id"),
+    (
+        "name", "asc", "Отчет",
+        "(task.name > :cursor_value"
+        " OR (task.name = :cursor_value AND task.id > :cursor_id)"
+        " OR task.name IS NULL)",
+    ),
+    (
+        "deadline_end", "desc", None,
+        "(task.deadline_end IS NULL AND task.id < :cursor_id)",
+    ),
+])
+def test_keyset_condition(order_by, direction, value, expected):
+    filters = TaskFilterParams(order_by=order_by, order_direction=direction)
+    cursor = TaskCursorDTO(value=value, id=42)
+
+    assert TaskRepository._build_keyset_condition(filters, cursor) == expected
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.core import password
+from src.core.config import settings
+from src.exception.exceptions import ServiceOverloadedException
+
+
+def _blocked(started: threading.Event, release: threading.Event) -> str:
+    started.set()
+    release.wait(5)
+    return "done"
+
+
+def _wait_until_idle() -> None:
+    for _ in range(500):
+        if password._pending == 0:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("очередь хеширования не освободилась")
+
+
+def test_hash_queue_rejects_over_limit(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+    started, release = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(
+            password._run_in_hash_executor("test", _blocked, started, release)
+        )
+        await asyncio.to_thread(started.wait, 5)
+
+        with pytest.raises(ServiceOverloadedException) as exc_info:
+            await password._run_in_hash_executor("test", str, "x")
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        assert await running == "done"
+
+    asyncio.run(scenario())
+    _wait_until_idle()
+
+
+def test_cancelled_request_keeps_slot_until_hash_finishes(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+    started, release = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(
+            password._run_in_hash_executor("test", _blocked, started, release)
+        )
+        await asyncio.to_thread(started.wait, 5)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+        # Поток все еще занят хешем, место в очереди не освобождено.
+        assert password._pending == 1
+        with pytest.raises(ServiceOverloadedException):
+            await password._run_in_hash_executor("test", str, "x")
+
+        release.set()
+        await asyncio.to_thread(_wait_until_idle)
+        assert await password._run_in_hash_executor("test", str, "x") == "x"
+
+    asyncio.run(scenario())
+    _wait_until_idle()
@@ -0,0 +1,70 @@
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import src.db.connection as db_connection
+from src.api.deps import get_task_repository, get_user_repository
+from src.repository.tasks.tasks import TaskRepository
+from src.repository.users.users import UserRepository
+
+UNREACHABLE_URL = "postgresql+asyncpg://nobody@127.0.0.1:1/none"
+
+
+def _client(monkeypatch, database_url: str) -> TestClient:
+    """
+    Приложение с одним эндпоинтом, которому нужны оба репозитория.
+
+    Эндпоинт возвращает, одна ли у них сессия и сколько соединений
+    взято из пула до запроса к БД и во время него.
+    """
+    engine = create_async_engine(database_url, pool_size=1, max_overflow=0)
+    monkeypatch.setattr(
+        db_connection, "async_session_factory",
+        async_sessionmaker(engine, expire_on_commit=False),
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await engine.dispose()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/")
+    async def endpoint(
+        task_repo: Annotated[TaskRepository, Depends(get_task_repository)],
+        user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+        query: bool = False,
+    ) -> dict:
+        result = {
+            "shared": task_repo.session is user_repo.session,
+            "before": engine.pool.checkedout(),
+        }
+        if query:
+            async with task_repo.session.begin():
+                await task_repo.session.execute(text("SELECT 1"))
+                result["during"] = engine.pool.checkedout()
+        return result
+
+    app.state.engine = engine
+    return TestClient(app)
+
+
+def test_request_shares_one_session_without_touching_pool(monkeypatch):
+    with _client(monkeypatch, UNREACHABLE_URL) as client:
+        response = client.get("/")
+
+    assert response.json() == {"shared": True, "before": 0}
+
+
+def test_connection_is_checked_out_only_for_query(monkeypatch, database_url):
+    with _client(monkeypatch, database_url) as client:
+        response = client.get("/", params={"query": True})
+        assert client.app.state.engine.pool.checkedout() == 0
+
+    assert response.json() == {"shared": True, "before": 0, "during": 1}
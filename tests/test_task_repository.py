@@ -0,0 +1,230 @@
+import asyncio
+import datetime
+
+import pytest
+
+from src.model.filters import TaskFilterParams, TaskSearchParams
+from src.repository.tasks.dto import (
+    DocumentCreateDTO, TagCreateDTO, TaskBulkUpdateDTO, TaskCreateDTO,
+    TaskUpdateDTO,
+)
+from src.repository.tasks.pagination import (
+    encode_search_cursor, encode_task_cursor
+)
+from src.repository.tasks.tasks import TaskRepository
+from tests.db import count_queries, status_ids, user_session
+
+MISSING_STATUS_ID = 10 ** 12
+
+
+def test_bulk_create_maps_rows_to_input_and_skips_unknown_status(
+    database_url,
+):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            status_id = (await status_ids(session))[0]
+            repo = TaskRepository(session)
+            names = [f"task-{i}" for i in range(5)]
+            statuses = [
+                status_id, MISSING_STATUS_ID, None, status_id,
+                MISSING_STATUS_ID,
+            ]
+
+            tasks = await repo.bulk_create_tasks([
+                TaskCreateDTO(name=name, status_id=status, user_id=user_id)
+                for name, status in zip(names, statuses)
+            ])
+
+            assert [task and task.name for task in tasks] == [
+                "task-0", None, "task-2", "task-3", None,
+            ]
+            assert tasks[0].status.id == status_id
+            assert tasks[2].status is None
+
+    asyncio.run(scenario())
+
+
+def test_bulk_update_skips_items_with_unknown_status(database_url):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            status_id = (await status_ids(session))[0]
+            repo = TaskRepository(session)
+            created = await repo.bulk_create_tasks([
+                TaskCreateDTO(name=f"task-{i}", user_id=user_id)
+                for i in range(2)
+            ])
+
+            updated, missing = await repo.bulk_update_tasks(
+                [
+                    TaskBulkUpdateDTO(
+                        id=created[0].id, status_id=MISSING_STATUS_ID
+                    ),
+                    TaskBulkUpdateDTO(
+                        id=created[1].id, name="renamed", status_id=status_id
+                    ),
+                ],
+                user_id,
+            )
+
+            assert missing == {MISSING_STATUS_ID}
+            assert [(task.id, task.name) for task in updated] == [
+                (created[1].id, "renamed"),
+            ]
+            assert updated[0].status.id == status_id
+
+    asyncio.run(scenario())
+
+
+def test_delete_tagged_tasks(database_url):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            repo = TaskRepository(session)
+            tasks = await repo.bulk_create_tasks([
+                TaskCreateDTO(name=f"task-{i}", user_id=user_id)
+                for i in range(3)
+            ])
+            tag = await repo.create_tag(
+                TagCreateDTO(name="tag", user_id=user_id)
+            )
+            for task in tasks:
+                await repo.add_tag_to_task(task.id, tag.id, user_id)
+
+            deleted_ids, _ = await repo.bulk_delete_tasks(
+                [tasks[0].id, tasks[1].id], user_id
+            )
+            await repo.delete_task(tasks[2].id, user_id)
+
+            assert sorted(deleted_ids) == [tasks[0].id, tasks[1].id]
+            assert await repo.get_tasks_by_ids(
+                [task.id for task in tasks], user_id
+            ) == []
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("order_by", [
+    "id", "name", "deadline_end", "status_id",
+])
+def test_keyset_pages_cover_all_tasks_once(database_url, order_by):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            statuses = await status_ids(session)
+            repo = TaskRepository(session)
+            created = await repo.bulk_create_tasks([
+                TaskCreateDTO(
+                    name=f"task-{i % 3}",
+                    deadline_end=(
+                        datetime.date(2026, 1, 1 + i % 4) if i % 2 else None
+                    ),
+                    status_id=statuses[i % 2] if i % 3 else None,
+                    user_id=user_id,
+                )
+                for i in range(11)
+            ])
+
+            filters = TaskFilterParams(limit=3, order_by=order_by)
+            seen = []
+            while True:
+                page = await repo.get_all_tasks(filters, user_id)
+                seen.extend(task.id for task in page)
+                if len(page) < filters.limit:
+                    break
+                filters = filters.model_copy(update={
+                    "cursor": encode_task_cursor(page[-1], filters)
+                })
+
+            assert sorted(seen) == sorted(task.id for task in created)
+
+    asyncio.run(scenario())
+
+
+def test_search_ranks_matches_and_pages_by_cursor(database_url):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            repo = TaskRepository(session)
+            created = await repo.bulk_create_tasks([
+                TaskCreateDTO(
+                    name="Квартальный отчет",
+                    description="отчет для отчета",
+                    user_id=user_id,
+                ),
+                TaskCreateDTO(name="Отчет", user_id=user_id),
+                TaskCreateDTO(name="Купить молоко", user_id=user_id),
+                TaskCreateDTO(name="Годовой отчет", user_id=user_id),
+            ])
+
+            params = TaskSearchParams(q="отчет", limit=2)
+            found = []
+            while True:
+                page = await repo.search_tasks(params, user_id)
+                found.extend(page)
+                if len(page) < params.limit:
+                    break
+                params = params.model_copy(update={
+                    "cursor": encode_search_cursor(page[-1])
+                })
+
+            assert found[0].id == created[0].id
+            assert [task.rank for task in found] == sorted(
+                (task.rank for task in found), reverse=True
+            )
+            assert sorted(task.id for task in found) == sorted(
+                created[i].id for i in (0, 1, 3)
+            )
+
+    asyncio.run(scenario())
+
+
+def test_task_list_query_count_does_not_grow_with_page(database_url):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            repo = TaskRepository(session)
+            tag = await repo.create_tag(
+                TagCreateDTO(name="tag", user_id=user_id)
+            )
+
+            async def list_queries(task_count: int) -> int:
+                tasks = await repo.bulk_create_tasks([
+                    TaskCreateDTO(name=f"task-{i}", user_id=user_id)
+                    for i in range(task_count)
+                ])
+                for task in tasks:
+                    await repo.add_tag_to_task(task.id, tag.id, user_id)
+                    await repo.create_document(DocumentCreateDTO(
+                        name="a.txt", path="blobs/x", task_id=task.id
+                    ), user_id)
+
+                with count_queries(session) as statements:
+                    page = await repo.get_all_tasks(
+                        TaskFilterParams(), user_id
+                    )
+                await session.rollback()
+                assert all(task.tags and task.documents for task in page)
+                return len(statements)
+
+            assert await list_queries(1) == await list_queries(10)
+
+    asyncio.run(scenario())
+
+
+def test_update_task_is_one_statement(database_url):
+    async def scenario():
+        async with user_session(database_url) as (session, user_id):
+            status_id = (await status_ids(session))[0]
+            repo = TaskRepository(session)
+            [task] = await repo.bulk_create_tasks([
+                TaskCreateDTO(name="task", user_id=user_id)
+            ])
+
+            with count_queries(session) as statements:
+                updated = await repo.update_task(
+                    task.id,
+                    TaskUpdateDTO(name="renamed", status_id=status_id),
+                    user_id,
+                )
+
+            assert len(statements) == 1
+            assert updated.name == "renamed"
+            assert updated.status.id == status_id
+
+    asyncio.run(scenario())
@@ -0,0 +1,33 @@
+from tests.api import TEST_USER, tasks_client
+
+
+class SearchService:
+    def __init__(self):
+        self.calls = []
+
+    async def search_tasks(self, params, user_id):
+        self.calls.append((params, user_id))
+        return [], None
+
+
+def test_search_passes_query_params():
+    service = SearchService()
+
+    response = tasks_client(service).get(
+        "/api/v1/tasks/search", params={"q": "отчет", "limit": 5}
+    )
+
+    assert response.status_code == 200
+    params, user_id = service.calls[0]
+    assert (params.q, params.limit, user_id) == ("отчет", 5, TEST_USER.id)
+
+
+def test_search_rejects_unknown_params():
+    service = SearchService()
+
+    response = tasks_client(service).get(
+        "/api/v1/tasks/search", params={"q": "отчет", "bogus": "1"}
+    )
+
+    assert response.status_code == 422
+    assert service.calls == []
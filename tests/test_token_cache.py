@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from src.core.token_cache import VerifiedTokenCache
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    monkeypatch.setattr("src.core.token_cache.time.time", lambda: NOW)
+
+
+def test_token_is_cached_until_exp():
+    cache = VerifiedTokenCache()
+    cache.set("valid", user_id=1, scopes=["user"], exp=NOW + 1)
+    cache.set("expired", user_id=1, scopes=["user"], exp=NOW)
+
+    assert cache.get("valid") == (1, ["user"])
+    assert cache.get("expired") is None
+    assert cache.get("unknown") is None
+    assert len(cache._data) == 1
+
+
+def test_cache_stores_token_digest_not_token():
+    cache = VerifiedTokenCache()
+    cache.set("secret-token", user_id=1, scopes=[], exp=NOW + 60)
+
+    assert "secret-token" not in cache._data
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.set("a", user_id=1, scopes=[], exp=NOW + 60)
+    cache.set("b", user_id=2, scopes=[], exp=NOW + 60)
+    cache.get("a")
+
+    cache.set("c", user_id=3, scopes=[], exp=NOW + 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (1, [])
+    assert cache.get("c") == (3, [])
+
+
+def test_signout_evicts_only_tokens_of_user():
+    cache = VerifiedTokenCache()
+    cache.set("a1", user_id=1, scopes=[], exp=NOW + 60)
+    cache.set("a2", user_id=1, scopes=[], exp=NOW + 60)
+    cache.set("b", user_id=2, scopes=[], exp=NOW + 60)
+
+    asyncio.run(cache.handle_signout({"user_id": "1"}))
+
+    assert cache.get("a1") is None
+    assert cache.get("a2") is None
+    assert cache.get("b") == (2, [])
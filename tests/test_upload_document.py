@@ -0,0 +1,88 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from src.repository.tasks.dto import DeletedDocumentDTO, DocumentDTO
+from src.service.tasks import TaskService
+
+USER_ID = 1
+TASK_ID = 7
+DOCUMENT_ID = 42
+
+
+class StubRepository:
+    def __init__(self, remaining_refs: int = 0):
+        self.remaining_refs = remaining_refs
+        self.documents: dict[int, DocumentDTO] = {}
+
+    async def create_document(self, data, user_id):
+        doc = DocumentDTO(id=DOCUMENT_ID, name=data.name, path=data.path)
+        self.documents[doc.id] = doc
+        return doc
+
+    async def delete_document(self, document_id, user_id):
+        doc = self.documents.pop(document_id)
+        return DeletedDocumentDTO(
+            **doc.model_dump(),
+            task_id=TASK_ID,
+            remaining_refs=self.remaining_refs,
+        )
+
+
+class BrokenPromoteStorage:
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+
+    async def upload_temp(self, chunks):
+        self.objects["tmp/upload"] = b"".join([chunk async for chunk in chunks])
+        return "tmp/upload"
+
+    async def promote(self, temp_key, key):
+        raise OSError("storage unavailable")
+
+    async def delete(self, key):
+        self.objects.pop(key, None)
+
+
+def _upload(service: TaskService) -> None:
+    file = UploadFile(io.BytesIO(b"payload"), filename="a.txt")
+    asyncio.run(service.upload_document(TASK_ID, file, USER_ID))
+
+
+@pytest.fixture
+def cleanup(monkeypatch):
+    scheduled = []
+
+    async def schedule(files):
+        scheduled.extend(files)
+
+    monkeypatch.setattr(
+        TaskService, "_schedule_file_cleanup", staticmethod(schedule)
+    )
+    return scheduled
+
+
+def test_failed_promote_removes_document_row_and_temp_object(cleanup):
+    repo, storage = StubRepository(), BrokenPromoteStorage()
+    service = TaskService(repo, cache_repo=None, storage=storage)
+
+    with pytest.raises(OSError):
+        _upload(service)
+
+    assert repo.documents == {}
+    assert storage.objects == {}
+    [blob] = cleanup
+    assert blob.path == TaskService._blob_key(blob.digest)
+
+
+def test_failed_promote_keeps_blob_shared_with_other_documents(cleanup):
+    repo, storage = StubRepository(remaining_refs=1), BrokenPromoteStorage()
+    service = TaskService(repo, cache_repo=None, storage=storage)
+
+    with pytest.raises(OSError):
+        _upload(service)
+
+    assert repo.documents == {}
+    assert cleanup == []
@@ -0,0 +1,86 @@
+import pytest
+
+from src.core.config import settings
+from tests.api import tasks_client
+
+MAX_SIZE = 1024
+URL = "/api/v1/tasks/1/document"
+
+
+class UploadService:
+    def __init__(self):
+        self.uploads = []
+
+    async def upload_document(self, task_id, file, user_id):
+        self.uploads.append(await file.read())
+        return {"id": 1, "name": file.filename, "path": "blobs/x"}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_SIZE", MAX_SIZE)
+    return UploadService()
+
+
+def _multipart(size: int) -> tuple[bytes, str]:
+    boundary = "test-boundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="a.bin"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + b"x" * size + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def test_upload_within_limit_reaches_service(service):
+    body, content_type = _multipart(MAX_SIZE)
+
+    response = tasks_client(service).post(
+        URL, content=body, headers={"content-type": content_type}
+    )
+
+    assert response.status_code == 201
+    assert service.uploads == [b"x" * MAX_SIZE]
+
+
+def test_upload_rejected_by_content_length(service):
+    body, content_type = _multipart(MAX_SIZE + 128 * 1024)
+
+    response = tasks_client(service).post(
+        URL, content=body, headers={"content-type": content_type}
+    )
+
+    assert response.status_code == 413
+    assert service.uploads == []
+
+
+def test_chunked_upload_rejected_while_streaming(service):
+    body, content_type = _multipart(MAX_SIZE + 128 * 1024)
+
+    def chunks():
+        for i in range(0, len(body), 8192):
+            yield body[i:i + 8192]
+
+    response = tasks_client(service).post(
+        URL, content=chunks(), headers={"content-type": content_type}
+    )
+
+    assert response.status_code == 413
+    assert service.uploads == []
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_upload_with_malformed_content_length(service, content_length):
+    body, content_type = _multipart(10)
+
+    response = tasks_client(service).post(
+        URL,
+        content=body,
+        headers={
+            "content-type": content_type,
+            "content-length": content_length,
+        },
+    )
+
+    assert response.status_code == 400
+    assert service.uploads == []